@@ -0,0 +1,74 @@
+"""
+Benchmark for create_skipped_questions on a synthetic staged dataframe.
+
+Run from the root folder with:
+
+    python -m benchmarks.benchmark_create_skipped_questions 10000 50000 200000
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from cons_results.staging.create_skipped_questions import create_skipped_questions
+
+COMPONENTS_QUESTIONS = [201, 202, 211, 212, 221, 222, 231, 232, 241, 242, 243]
+STATUSES = ["Clear", "Clear - overridden", "Form sent out", "Check needed"]
+
+
+def make_staged_df(n_references: int, n_periods: int = 15, seed: int = 0):
+    """Synthetic staged dataframe, roughly half of the component questions are
+    returned for each reference and period."""
+    rng = np.random.default_rng(seed)
+    periods = pd.period_range("2023-01", periods=n_periods, freq="M")
+    periods = periods.strftime("%Y%m").astype(int)
+    questions = COMPONENTS_QUESTIONS + [290]
+
+    df = pd.DataFrame(
+        {
+            "reference": np.repeat(np.arange(n_references), n_periods * len(questions)),
+            "period": np.tile(np.repeat(periods, len(questions)), n_references),
+            "questioncode": np.tile(questions, n_references * n_periods),
+        }
+    )
+    df = df[(df["questioncode"] == 290) | (rng.random(len(df)) < 0.5)]
+
+    contributors = df[["reference", "period"]].drop_duplicates()
+    contributors["status"] = rng.choice(STATUSES, len(contributors))
+    contributors["runame1"] = "runame_" + contributors["reference"].astype(str)
+    contributors["region"] = rng.choice(["AA", "BB", "XX", "WW"], len(contributors))
+    contributors["cell_no"] = rng.integers(1, 8, len(contributors)) + 5140
+
+    df = df.merge(contributors, on=["reference", "period"])
+    df["adjustedresponse"] = rng.random(len(df)) * 1000
+    df["290_flag"] = False
+
+    return df.reset_index(drop=True)
+
+
+def run(n_references: int) -> float:
+    df = make_staged_df(n_references)
+
+    start = time.perf_counter()
+    create_skipped_questions(
+        df=df,
+        all_questions=COMPONENTS_QUESTIONS,
+        reference="reference",
+        period="period",
+        question_col="questioncode",
+        target_col="adjustedresponse",
+        contributors_keep_col=["period", "reference", "status"],
+        responses_keep_col=["adjustedresponse", "period", "questioncode", "reference"],
+        finalsel_keep_col=["cell_no", "reference", "region", "runame1"],
+        status_col="status",
+        status_filter=["Clear", "Clear - overridden"],
+        flag_col_name="skipped_question",
+    )
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[1:]] or [10_000, 50_000, 200_000]
+    for n_references in sizes:
+        print(f"{n_references:>8} references: {run(n_references):.2f}s")
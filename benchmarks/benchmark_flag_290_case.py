@@ -0,0 +1,39 @@
+"""
+Benchmark for flag_290_case on a synthetic snapshot, responses already have the
+contributor status joined as they do in staging.
+
+Run from the root folder with:
+
+    python -m benchmarks.benchmark_flag_290_case 10000 50000
+"""
+import sys
+import time
+import tracemalloc
+
+from benchmarks.benchmark_staging_flags import make_snapshot
+from cons_results.staging.stage_dataframe import flag_290_case, join_contributor_status
+
+
+def run(n_references: int) -> (float, float):
+    responses, contributors = make_snapshot(n_references)
+    responses = join_contributor_status(
+        responses, contributors, "period", "reference", ["status"]
+    )
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    flag_290_case(
+        responses, None, "period", "reference", "questioncode", "adjustedresponse"
+    )
+    wall_time = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return wall_time, peak / 1024**2
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[1:]] or [10_000, 50_000]
+    for n_references in sizes:
+        wall_time, peak = run(n_references)
+        print(f"{n_references:>8} references: {wall_time:.2f}s peak {peak:.1f} MiB")
@@ -0,0 +1,159 @@
+"""
+Benchmark for the staging flags (run_live_or_frozen, flag_290_case and
+flag_total_only_and_zero), comparing each flag merging responses with
+contributors against the flags sharing one joined view.
+
+Run from the root folder with:
+
+    python -m benchmarks.benchmark_staging_flags 50000
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from cons_results.staging.live_or_frozen import run_live_or_frozen
+from cons_results.staging.stage_dataframe import flag_290_case, join_contributor_status
+from cons_results.staging.total_as_zero import flag_total_only_and_zero
+
+QUESTIONS = [201, 202, 211, 212, 221, 222, 231, 232, 241, 242, 243, 290]
+STATUSES = {
+    "Clear": 210,
+    "Clear - overridden": 211,
+    "Check needed": 201,
+    "Form sent out": 100,
+}
+CLEAR_STATUSES = ["Clear", "Clear - overridden"]
+CURRENT_PERIOD = 202403
+REVISION_WINDOW = 15
+
+
+def make_snapshot(n_references: int, seed: int = 0):
+    """Synthetic staged responses and contributors (joined with finalsel)."""
+    rng = np.random.default_rng(seed)
+    periods = pd.period_range(end="2024-03", periods=REVISION_WINDOW + 1, freq="M")
+    periods = periods.to_timestamp()
+
+    contributors = pd.DataFrame(
+        {
+            "period": np.tile(periods, n_references),
+            "reference": np.repeat(np.arange(n_references), len(periods)),
+        }
+    )
+    contributors["status"] = rng.choice(list(STATUSES), len(contributors))
+    contributors["statusencoded"] = contributors["status"].map(STATUSES)
+    contributors["formtype"] = "0001"
+    contributors["cell_no"] = rng.integers(1, 8, len(contributors)) + 5140
+    contributors["froempment"] = rng.integers(0, 500, len(contributors))
+    contributors["frotover"] = rng.random(len(contributors)) * 1e5
+    contributors["region"] = rng.choice(["AA", "BB", "XX", "WW"], len(contributors))
+    contributors["runame1"] = "runame_" + contributors["reference"].astype(str)
+    contributors["entname1"] = "entname_" + contributors["reference"].astype(str)
+
+    responses = contributors[["period", "reference"]].merge(
+        pd.DataFrame({"questioncode": QUESTIONS}), how="cross"
+    )
+    # A tenth of contributors only return the total, half of these as zero
+    total_only = rng.random(len(contributors)) < 0.1
+    is_total_only = np.repeat(total_only, len(QUESTIONS))
+    is_total = responses["questioncode"] == 290
+    returned = np.where(is_total_only, is_total, rng.random(len(responses)) < 0.6)
+    responses["adjustedresponse"] = np.where(
+        is_total_only & (rng.random(len(responses)) < 0.5),
+        0,
+        rng.random(len(responses)) * 1000,
+    )
+    responses = responses[returned].reset_index(drop=True)
+    responses["response"] = responses["adjustedresponse"].astype(str)
+
+    return responses, contributors
+
+
+def flag_separately(responses, contributors):
+    responses, frozen = run_live_or_frozen(
+        responses,
+        contributors,
+        "period",
+        "reference",
+        "questioncode",
+        "adjustedresponse",
+        "statusencoded",
+        CURRENT_PERIOD,
+        REVISION_WINDOW,
+        state="frozen",
+        error_values=[201],
+    )
+    responses = flag_290_case(
+        responses,
+        contributors,
+        "period",
+        "reference",
+        "questioncode",
+        "adjustedresponse",
+    )
+    return flag_total_only_and_zero(
+        responses,
+        contributors,
+        "reference",
+        "period",
+        "adjustedresponse",
+        "questioncode",
+        CLEAR_STATUSES,
+    )
+
+
+def flag_with_shared_view(responses, contributors):
+    status_cols = ["status", "statusencoded"]
+    responses = join_contributor_status(
+        responses, contributors, "period", "reference", status_cols
+    )
+    responses, frozen = run_live_or_frozen(
+        responses,
+        None,
+        "period",
+        "reference",
+        "questioncode",
+        "adjustedresponse",
+        "statusencoded",
+        CURRENT_PERIOD,
+        REVISION_WINDOW,
+        state="frozen",
+        error_values=[201],
+    )
+    responses = flag_290_case(
+        responses, None, "period", "reference", "questioncode", "adjustedresponse"
+    )
+    responses = flag_total_only_and_zero(
+        responses,
+        None,
+        "reference",
+        "period",
+        "adjustedresponse",
+        "questioncode",
+        CLEAR_STATUSES,
+    )
+    return responses.drop(columns=status_cols)
+
+
+def measure(function, responses, contributors):
+    tracemalloc.start()
+    start = time.perf_counter()
+    function(responses.copy(), contributors)
+    wall_time = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return wall_time, peak / 1024**2
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[1:]] or [10_000, 50_000]
+    for n_references in sizes:
+        responses, contributors = make_snapshot(n_references)
+        for function in [flag_separately, flag_with_shared_view]:
+            wall_time, peak = measure(function, responses, contributors)
+            print(
+                f"{n_references:>8} references {function.__name__:<22}"
+                f" {wall_time:6.2f}s peak {peak:8.1f} MiB"
+            )
@@ -1,3 +1,5 @@
+from functools import partial
+
 import pandas as pd
 from mbs_results.imputation.ratio_of_means import ratio_of_means
 from mbs_results.staging.data_cleaning import convert_annual_thousands
@@ -12,6 +14,7 @@ from cons_results.imputation.post_imputation import (
     validate_r_before_derived_zero,
 )
 from cons_results.staging.create_skipped_questions import create_skipped_questions
+from cons_results.utilities.parallel import groupby_apply
 
 
 def impute(
@@ -30,7 +33,8 @@ def impute(
     manual_constructions : pd.DataFrame
         manual_constructions : pd.DataFrame
     config : dict
-        config file containing column names and manual construction path
+        config file containing column names and manual construction path, if
+        imputation_workers is set questions are imputed on a process pool
     filter_df : pd.DataFrame
         filter_df df from the staging module
 
@@ -42,27 +46,15 @@ def impute(
         imputation
     """
 
-    df = df.groupby(config["question_no"])[df.columns].apply(
-        lambda df_q_code: ratio_of_means(
-            df=df_q_code,
-            manual_constructions=manual_constructions,
-            reference=config["reference"],
-            target=config["target"],
-            period=config["period"],
-            current_period=config["current_period"],
-            revision_window=config["revision_window"],
-            question_no=config["question_no"],
-            strata="imputation_class",
-            auxiliary=config["auxiliary_converted"],
-            filters=filter_df,
-        )
-    )
+    df, passengers = drop_passenger_columns(df, config)
 
-    df = df.reset_index(drop=True)  # remove groupby leftovers
+    df = impute_questions(df, config, manual_constructions, filter_df)
 
     df = df[~df["is_backdata"]]  # remove backdata
     df.drop(columns=["is_backdata"], inplace=True)
 
+    df = join_passenger_columns(df, passengers, config)
+
     df = create_skipped_questions(
         df=df,
         all_questions=config["components_questions"],
@@ -82,23 +74,15 @@ def impute(
     # derived zeros types is object, has true false and na
     df.loc[df["derived_zeros"] == 1, config["imputation_marker_col"]] = "d"
 
-    # Updating derived questions with converted auxiliary values
-    null_rows = df[df[config["auxiliary_converted"]].isna()]
+    # Later steps used to get a new RangeIndex from re-indexing by key here,
+    # the index is replaced without copying the frame
+    df.index = pd.RangeIndex(len(df))
 
-    updated_rows = convert_annual_thousands(
-        null_rows, config["auxiliary_converted"], config["auxiliary"]
+    # Updating derived questions with converted auxiliary values
+    df = fill_converted_auxiliary(
+        df, config["auxiliary_converted"], config["auxiliary"]
     )
 
-    updated_rows.set_index(["reference", "period", "questioncode"], inplace=True)
-
-    df.set_index(["reference", "period", "questioncode"], inplace=True)
-
-    df.loc[updated_rows.index, config["auxiliary_converted"]] = updated_rows[
-        config["auxiliary_converted"]
-    ]
-
-    df.reset_index(inplace=True)
-
     df = rescale_290_case(
         df,
         config["period"],
@@ -160,6 +144,175 @@ def impute(
         config["imputation_marker_col"],
         config["period"],
         config["reference"],
+        output_path=config["output_path"],
+        output_file_name=get_versioned_filename(
+            "validate_r_before_derived_zero_output", config["run_id"]
+        ),
+        import_platform=config["platform"],
+        bucket_name=config["bucket"],
     )
 
     return df
+
+
+def impute_questions(
+    df: pd.DataFrame,
+    config: dict,
+    manual_constructions: pd.DataFrame = None,
+    filter_df: pd.DataFrame = None,
+) -> pd.DataFrame:
+    """
+    Imputes every question with ratio_of_means, on a process pool if
+    imputation_workers is set in config, otherwise serially.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        df with both contributors and responses, without passenger columns
+    config : dict
+        config file containing column names
+    manual_constructions : pd.DataFrame
+        manual_constructions : pd.DataFrame
+    filter_df : pd.DataFrame
+        filter_df df from the staging module
+
+    Returns
+    -------
+    pd.DataFrame
+        Imputed df in question order, with a new RangeIndex.
+    """
+    ratio_of_means_by_question = partial(
+        ratio_of_means,
+        manual_constructions=manual_constructions,
+        reference=config["reference"],
+        target=config["target"],
+        period=config["period"],
+        current_period=config["current_period"],
+        revision_window=config["revision_window"],
+        question_no=config["question_no"],
+        strata="imputation_class",
+        auxiliary=config["auxiliary_converted"],
+        filters=filter_df,
+    )
+
+    if config.get("imputation_workers"):
+        # Questions are imputed independently, results are concatenated in
+        # question order so output matches the serial groupby
+        df = groupby_apply(
+            df,
+            config["question_no"],
+            ratio_of_means_by_question,
+            max_workers=config["imputation_workers"],
+        )
+
+    else:
+        df = df.groupby(config["question_no"])[df.columns].apply(
+            lambda df_q_code: ratio_of_means_by_question(df=df_q_code)
+        )
+
+    return df.reset_index(drop=True)  # remove groupby leftovers
+
+
+def drop_passenger_columns(
+    df: pd.DataFrame, config: dict
+) -> (pd.DataFrame, pd.DataFrame):
+    """
+    Drops the contributor attributes which ratio_of_means does not read, so
+    they are not carried through imputation of every question. They are
+    joined back with join_passenger_columns.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe to impute.
+    config : dict
+        main pipeline configuration.
+
+    Returns
+    -------
+    df : pd.DataFrame
+        df without the passenger columns.
+    passengers : pd.DataFrame
+        Passenger columns with a row per reference and period.
+    """
+    keys = [config["reference"], config["period"]]
+    passenger_cols = [
+        col
+        for col in config["finalsel_keep_cols"]
+        if col in df.columns
+        and col not in keys + [config["auxiliary"], config["cell_number"]]
+    ]
+
+    passengers = df[keys + passenger_cols].drop_duplicates(subset=keys)
+
+    return df.drop(columns=passenger_cols), passengers
+
+
+def join_passenger_columns(
+    df: pd.DataFrame, passengers: pd.DataFrame, config: dict
+) -> pd.DataFrame:
+    """
+    Joins back the passenger columns dropped by drop_passenger_columns, by
+    reference and period. Rows of df keep their order.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Imputed dataframe.
+    passengers : pd.DataFrame
+        Passenger columns from drop_passenger_columns.
+    config : dict
+        main pipeline configuration.
+
+    Returns
+    -------
+    pd.DataFrame
+        df with the passenger columns.
+    """
+    return df.merge(
+        passengers,
+        how="left",
+        on=[config["reference"], config["period"]],
+        validate="many_to_one",
+    )
+
+
+def fill_converted_auxiliary(
+    df: pd.DataFrame, auxiliary_converted: str, auxiliary: str
+) -> pd.DataFrame:
+    """
+    Converts the auxiliary for rows where the converted auxiliary is missing,
+    e.g. derived zeros created after imputation. Only the masked rows are
+    converted and the converted auxiliary column of df is updated in place by
+    position, so the frame is neither copied nor re-indexed and duplicated
+    index labels are allowed.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe with auxiliary and converted auxiliary columns.
+    auxiliary_converted : str
+        Column name containing the auxiliary converted into monthly pounds.
+    auxiliary : str
+        Column name containing the auxiliary.
+
+    Returns
+    -------
+    pd.DataFrame
+        df with missing converted auxiliary filled.
+    """
+    null_mask = df[auxiliary_converted].isna().to_numpy()
+
+    updated_rows = convert_annual_thousands(
+        df.loc[null_mask, [auxiliary_converted, auxiliary]],
+        auxiliary_converted,
+        auxiliary,
+    )
+
+    # only this column is copied, the values of the masked rows are replaced
+    converted = df[auxiliary_converted].to_numpy(copy=True)
+    converted[null_mask] = updated_rows[auxiliary_converted].to_numpy()
+
+    df[auxiliary_converted] = converted
+
+    return df
@@ -6,6 +6,13 @@ import numpy as np
 import pandas as pd
 from mbs_results.utilities.outputs import write_csv_wrapper
 
+from cons_results.utilities.grouping import (
+    broadcast_to_rows,
+    group_codes,
+    grouped_sum,
+)
+from cons_results.utilities.joins import is_in_keys
+
 
 def rescale_290_case(
     df: pd.DataFrame,
@@ -42,39 +49,36 @@ def rescale_290_case(
 
     df["adjustedresponse_pre_rescale"] = df[adjusted_response].copy()
 
+    codes, n_groups = group_codes(df, [period, reference])
+
     # 290_flag hard coded column from flag_290_cases in staging
-    numer = (
-        df[(df["290_flag"]) & (df[question_no] == 290)]
-        .groupby([period, reference])[adjusted_response]
-        .sum()
+    numer = grouped_sum(
+        df[adjusted_response],
+        codes,
+        n_groups,
+        (df["290_flag"]) & (df[question_no] == 290),
     )
 
-    denom = (
-        df[(df["290_flag"]) & (df[question_no] != 290)]
-        .groupby([period, reference])[adjusted_response]
-        .sum()
+    denom = grouped_sum(
+        df[adjusted_response],
+        codes,
+        n_groups,
+        (df["290_flag"]) & (df[question_no] != 290),
     )
 
-    ratio = numer / denom  # has inf when dem is 0
-
-    ratio.name = "ratio"
-
-    df["ratio"] = df.set_index([period, reference]).index.map(ratio)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = broadcast_to_rows(numer / denom, codes)  # has inf when dem is 0
 
     # want to avoid multiplying with inf and np.nan,
     # np.inf comes from division with 0
 
-    multiple_mask = (df[question_no] != 290) & (
-        np.isfinite(df["ratio"]) & (df["290_flag"])
-    )
+    multiple_mask = (df[question_no] != 290) & (np.isfinite(ratio) & (df["290_flag"]))
 
     df.loc[multiple_mask, adjusted_response] = (
-        df[multiple_mask]["ratio"] * df[multiple_mask][adjusted_response]
+        ratio[multiple_mask.to_numpy()] * df.loc[multiple_mask, adjusted_response]
     )
 
-    df["failed_rescale"] = np.isinf(df["ratio"])
-
-    df.drop(columns=["ratio"], inplace=True)
+    df["failed_rescale"] = np.isinf(ratio)
 
     return df
 
@@ -117,11 +121,29 @@ def create_q290(
       in the period/reference group.
     """
 
-    missing_290 = df.groupby([period, reference]).filter(
-        lambda x: 290 not in x[question_no].values
-    )[[period, reference]]
+    keys = [period, reference]
+
+    # period/reference groups without a 290 row, the same groups as
+    # groupby().filter but found with a single set difference on keys
+    missing_290_mask = ~is_in_keys(df, df.loc[df[question_no] == 290], keys) & df[
+        keys
+    ].notna().all(axis=1)
+
+    contributors_cols = [
+        col
+        for col in dict.fromkeys(
+            config["contributors_keep_cols"] + config["finalsel_keep_cols"]
+        )
+        if col not in keys
+    ]
 
-    missing_290.drop_duplicates(inplace=True)
+    # Contributor lookup at period/reference level, only for missing groups
+    missing_290 = (
+        df.loc[missing_290_mask, keys + contributors_cols]
+        .groupby(keys, sort=False)
+        .first()
+        .reset_index()
+    )
 
     # d_create is temporary for debugging but shouldn't appear in final data
     missing_290 = missing_290.assign(
@@ -133,19 +155,6 @@ def create_q290(
         }
     )
 
-    missing_290.set_index([period, reference], inplace=True)
-
-    contributors_cols = list(
-        set(config["contributors_keep_cols"] + config["finalsel_keep_cols"])
-    )
-    contributors_df = df[contributors_cols]
-    contributors_df = contributors_df.groupby([period, reference]).first()
-
-    missing_290 = pd.concat(
-        [missing_290, contributors_df.loc[missing_290.index]], axis=1
-    )
-    missing_290.reset_index(inplace=True)
-
     df = pd.concat([df, missing_290]).reset_index(drop=True)
 
     return df
@@ -186,29 +195,23 @@ def derive_q290(
         (df[question_no] != 290) & (df[imputation_flag] != "r") & (df["290_flag"] == 0)
     )
 
-    imputed_components_sum = (
-        df[imputed_components_mask]
-        .groupby([period, reference])[adjustedresponse]
-        .sum()
-        .reset_index()
-        .rename(columns={adjustedresponse: "imputed_components_sum"})
-    )
-
-    df = df.merge(imputed_components_sum, on=[period, reference], how="left")
+    codes, n_groups = group_codes(df, [period, reference])
 
-    df["imputed_components_sum"] = df["imputed_components_sum"].fillna(
-        df[adjustedresponse]
-    )
+    imputed_components_sum = pd.Series(
+        broadcast_to_rows(
+            grouped_sum(df[adjustedresponse], codes, n_groups, imputed_components_mask),
+            codes,
+        ),
+        index=df.index,
+    ).fillna(df[adjustedresponse])
 
     q290_non_response = (df[question_no] == 290) & (df[imputation_flag] != "r")
-    df.loc[q290_non_response, adjustedresponse] = df.loc[
-        q290_non_response, "imputed_components_sum"
+    df.loc[q290_non_response, adjustedresponse] = imputed_components_sum[
+        q290_non_response
     ]
 
     df.loc[q290_non_response, imputation_flag] = "d"
 
-    df = df.drop(columns=["imputed_components_sum"])
-
     return df
 
 
@@ -223,11 +226,13 @@ def validate_q290(
     output_file_name: str = "",
     import_platform: str = "network",
     bucket_name: str = "",
+    sample_size: int = 5,
 ) -> None:
     """
     Validates that Q290 (total) values match the sum of their
     component questions for each period and reference.
-    Raises a warning and optionally outputs a CSV if mismatches are found.
+    Raises a warning with the number of mismatches and a sample of them, and
+    optionally writes all mismatches to a CSV if mismatches are found.
     df : pd.DataFrame
         Dataframe containing response-level data.
     question_no : str
@@ -249,6 +254,9 @@ def validate_q290(
         Default is "network".
     bucket_name : str, optional
         Name of the storage bucket if saving to S3. Default is empty.
+    sample_size : int, optional
+        Number of mismatched periods and references included in the warning.
+        Default is 5.
     Returns
     -------
     None
@@ -258,28 +266,32 @@ def validate_q290(
         If any Q290 values do not match the sum of their components within a tolerance.
     """
     q290_mask = df[question_no] == 290
-    df_q290 = df[q290_mask]
-    temp = (
-        df[~q290_mask]
-        .groupby([period, reference])[adjustedresponse]
-        .sum()
-        .reset_index()
-        .rename(columns={adjustedresponse: "components_sum"})
+
+    codes, n_groups = group_codes(df, [period, reference])
+
+    components_sum = broadcast_to_rows(
+        grouped_sum(df[adjustedresponse], codes, n_groups, ~q290_mask), codes
     )
-    df_q290 = df_q290.merge(temp, on=[period, reference], how="left")
+
+    df_q290 = df.loc[q290_mask].assign(components_sum=components_sum[q290_mask])
+
     mismatched_totals = df_q290.loc[
         abs(df_q290[adjustedresponse] - df_q290["components_sum"]) >= 1e-3,
         [period, reference, adjustedresponse, "components_sum", "failed_rescale"],
-    ]
+    ].reset_index(drop=True)
+
     if not mismatched_totals.empty:
+        # Only a sample of the mismatches is included in the warning, all of
+        # them are in the output file
+        sample = mismatched_totals[[period, reference]].head(sample_size)
+
         warnings.warn(
             "q290 values do not match the sum of components for "
-            f"{len(mismatched_totals)} periods and references: "
-            f"{mismatched_totals[[period, reference]].to_dict(orient='records')}"
+            f"{len(mismatched_totals)} periods and references, "
+            f"first {len(sample)}: {sample.to_dict(orient='records')}"
         )
         if output_file_name != "":
             # Only output file if a name is provided
-            output_file = f"{output_file_name}_{config['run_id']}"
             output_file = os.path.join(output_path, output_file_name)
             print(f"Saving mismatched q290 totals to {output_file}")
 
@@ -300,12 +312,20 @@ def validate_r_before_derived_zero(
     imputation_flag: str,
     period: str,
     reference: str,
+    output_path: str = "",
+    output_file_name: str = "",
+    import_platform: str = "network",
+    bucket_name: str = "",
 ) -> None:
     """
     Validates that for each period and reference, any component question with a
     derived_zero ('d') imputation flag is preceded by at least one response ('r')
     imputation flag. If a 'd' flag is found without a preceding 'r' flag, a warning
-    is logged with the relevant period and reference combinations.
+    is logged with all the relevant reference and questioncode combinations.
+
+    A 'd' flag is valid when the previous period of the same reference and
+    questioncode is flagged 'r' or 'd', so the check is done on the sorted flag
+    column by comparing each row with the previous one within its group.
 
     Parameters
     ----------
@@ -319,6 +339,15 @@ def validate_r_before_derived_zero(
         Name of the column in `df` representing the period (e.g., "period").
     reference : str
         Name of the column in `df` representing the reference variable.
+    output_path : str, optional
+        Directory path where the output CSV of combinations will be saved.
+    output_file_name : str, optional
+        Base name for the output CSV file. If empty, no file is written.
+    import_platform : str, optional
+        Platform identifier for file writing (e.g., "network" or "local").
+        Default is "network".
+    bucket_name : str, optional
+        Name of the storage bucket if saving to S3. Default is empty.
 
     Returns
     -------
@@ -329,50 +358,46 @@ def validate_r_before_derived_zero(
     """
     logger = logging.getLogger(__name__)
 
-    components_only = df.copy()
-    components_only = components_only[components_only[question_no] != 290]
-    components_only.sort_values(by=[reference, period], inplace=True)
+    components_only = df.loc[
+        df[question_no] != 290, [reference, question_no, period, imputation_flag]
+    ].sort_values(by=[reference, question_no, period], kind="stable")
 
-    grouped = components_only.groupby([reference, question_no]).agg(
-        {imputation_flag: lambda x: x.to_list()}
-    )
+    is_d = (components_only[imputation_flag] == "d").to_numpy()
+    is_r_or_d = components_only[imputation_flag].isin(["r", "d"]).to_numpy()
+
+    references = components_only[reference].to_numpy()
+    questions = components_only[question_no].to_numpy()
 
-    grouped = grouped[imputation_flag].squeeze()
+    group_start = np.ones(len(components_only), dtype=bool)
+    group_start[1:] = (references[1:] != references[:-1]) | (
+        questions[1:] != questions[:-1]
+    )
 
-    result = grouped.apply(check_r_before_d)
+    previous_r_or_d = np.zeros(len(components_only), dtype=bool)
+    previous_r_or_d[1:] = is_r_or_d[:-1]
+    previous_r_or_d[group_start] = False
 
-    false_indices = result[result.eq(False)].index
+    false_indices = (
+        components_only.loc[is_d & ~previous_r_or_d, [reference, question_no]]
+        .drop_duplicates()
+        .sort_values(by=[reference, question_no])
+    )
 
-    false_indices_list = false_indices.to_list()[0:5]
+    if not false_indices.empty:
+        false_indices_list = pd.MultiIndex.from_frame(false_indices).to_list()
 
-    if false_indices_list:
         logger.warning(
-            f"""These reference and questioncode combinations
-                       have a 'd' flag for components without being preceded
-                       by a response, which may be an error.
+            f"""These {len(false_indices_list)} reference and questioncode
+                       combinations have a 'd' flag for components without being
+                       preceded by a response, which may be an error.
                        Please check these: {false_indices_list}"""
         )
 
-
-def check_r_before_d(list_of_flags):
-    """Helper function to check if 'r' precedes 'd' in a list of imputation flags.
-    Parameters
-    ----------
-    list_of_flags : list
-        A list of imputation flags for a specific reference and question code."""
-
-    d_indices = [i for i, j in enumerate(list_of_flags) if j == "d"]
-
-    if "d" not in list_of_flags:
-        return True
-
-    first_index = max(d_indices[0] - 1, 0)
-
-    if list_of_flags[first_index] != "r":
-        return False
-
-    for index in d_indices[::-1]:
-        if list_of_flags[index - 1] not in ["r", "d"]:
-            return False
-
-    return True
+        if output_file_name != "":
+            write_csv_wrapper(
+                df=false_indices,
+                save_path=os.path.join(output_path, output_file_name),
+                import_platform=import_platform,
+                bucket_name=bucket_name,
+                index=False,
+            )
@@ -16,7 +16,10 @@ from mbs_results.utilities.validation_checks import (
 )
 
 from cons_results.imputation.impute import impute
-from cons_results.outlier_detection.detect_outlier import detect_outlier
+from cons_results.outlier_detection.detect_outlier import (
+    detect_outlier,
+    detect_outlier_sweep,
+)
 from cons_results.outputs.produce_additional_outputs import (
     get_additional_outputs_df,
     produce_additional_outputs,
@@ -49,6 +52,10 @@ def run_pipeline(config_user_dict=None):
     validate_estimation(df, config)
     save_df(df, "estimation_output", config, config["debug_mode"])
 
+    if config.get("l_values_sweep_paths"):
+        outlier_sweep = detect_outlier_sweep(df, config, config["l_values_sweep_paths"])
+        save_df(outlier_sweep, "outlier_sweep_output", config)
+
     df = detect_outlier(df, config)
     validate_outlier_detection(df, config)
     save_df(df, "outlier_output", config, config["debug_mode"])
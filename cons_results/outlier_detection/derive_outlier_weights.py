@@ -1,5 +1,8 @@
+import numpy as np
 import pandas as pd
 
+from cons_results.utilities.grouping import broadcast_to_rows, group_codes
+
 
 def derive_q290_outlier_weights(
     df: pd.DataFrame,
@@ -61,36 +64,53 @@ def derive_q290_outlier_weights(
 
     """
 
-    # Using the formula to calculate q290 outlier weights
-    components = df.copy()[df[question_no].isin(all_questions)]
-    components.loc[:, "o_weight_times_value"] = (
-        components["outlier_weight"] * components[target]
+    codes, n_groups = group_codes(df, [reference, period])
+
+    # Weighted sum and mean outlier weight of the components in one grouped pass
+    is_component = (df[question_no].isin(all_questions) & (codes >= 0)).to_numpy()
+
+    components = (
+        pd.DataFrame(
+            {
+                "o_weight_times_value": (df["outlier_weight"] * df[target]).to_numpy(),
+                "avg_component_o_weight": df["outlier_weight"].to_numpy(),
+            }
+        )[is_component]
+        .groupby(codes[is_component])
+        .agg({"o_weight_times_value": "sum", "avg_component_o_weight": "mean"})
+        .reindex(range(n_groups))
+    )
+
+    q290_rows = (df[question_no] == 290).to_numpy()
+    q290_codes = codes[q290_rows]
+
+    sum_o_weight_times_value = broadcast_to_rows(
+        components["o_weight_times_value"].to_numpy(), q290_codes
+    )
+    avg_component_o_weight = broadcast_to_rows(
+        components["avg_component_o_weight"].to_numpy(), q290_codes
     )
-    sum_o_weight_times_value = components.groupby([reference, period])[
-        "o_weight_times_value"
-    ].sum()
 
-    df.set_index([reference, period], inplace=True)
+    q290_o_weight = df.loc[q290_rows, "outlier_weight"].to_numpy(dtype=float, copy=True)
 
     # Setting outlier weight to 1 for q290 when component outlier weights are 1
     # (non-winsorised)
-    avg_component_o_weight = (
-        df[df[question_no].isin(all_questions)]
-        .groupby(["reference", "period"])["outlier_weight"]
-        .mean()
-    )
-    non_winsorised = avg_component_o_weight[avg_component_o_weight == 1.00]
-    df.loc[
-        df.index.isin(non_winsorised.index) & (df[question_no] == 290), "outlier_weight"
-    ] = 1.00
+    q290_o_weight[avg_component_o_weight == 1.00] = 1.00
 
     # Changing 290 outlier weight only when it hasn't already been set to 1
-    q290_mask = (df[question_no] == 290) & (df["outlier_weight"] != 1.00)
+    q290_mask = q290_o_weight != 1.00
 
-    df.loc[q290_mask, "outlier_weight"] = (
-        sum_o_weight_times_value / df.loc[q290_mask, target]
-    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q290_o_weight[q290_mask] = (
+            sum_o_weight_times_value[q290_mask]
+            / df.loc[q290_rows, target].to_numpy()[q290_mask]
+        )
+
+    df.loc[q290_rows, "outlier_weight"] = q290_o_weight
 
-    df.reset_index(inplace=True)
+    # Keys first and a new index, as returned when grouping on the index
+    df.insert(0, period, df.pop(period))
+    df.insert(0, reference, df.pop(reference))
+    df.index = pd.RangeIndex(len(df))
 
     return df
@@ -1,3 +1,5 @@
+from functools import partial
+
 import pandas as pd
 from mbs_results.outlier_detection.detect_outlier import join_l_values
 from mbs_results.outlier_detection.winsorisation import winsorise
@@ -6,6 +8,7 @@ from mbs_results.utilities.constrains import replace_with_manual_outlier_weights
 from cons_results.outlier_detection.derive_outlier_weights import (
     derive_q290_outlier_weights,
 )
+from cons_results.utilities.parallel import groupby_apply
 
 
 def detect_outlier(
@@ -17,23 +20,106 @@ def detect_outlier(
         df, config["l_values_path"], config["classification_values_path"], config
     )
 
+    post_win = winsorise_and_derive_weights(pre_win, config)
+
+    # This is needed for the additional outputs functions
+    post_win["winsorised_value"] = (
+        post_win["outlier_weight"] * post_win["adjustedresponse"]
+    )
+
+    return post_win
+
+
+def detect_outlier_sweep(
+    df: pd.DataFrame,
+    config: dict,
+    l_values_paths: dict,
+) -> pd.DataFrame:
+    """
+    Evaluates winsorisation under several l values tables, for sensitivity
+    analysis of the outlier weights. For each scenario the l values are joined
+    to df as in detect_outlier, then the joined frame is winsorised and the
+    q290 outlier weights are derived. The join is repeated for every scenario
+    since the columns join_l_values matches on are internal to mbs_results.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Imputed and estimated dataframe, as passed to detect_outlier.
+    config : dict
+        Config containing column names and file paths.
+    l_values_paths : dict
+        Mapping of scenario name to the path of its l values file.
+
+    Returns
+    -------
+    pd.DataFrame
+        Outlier weights and winsorised values of every scenario, with the
+        scenario name in a scenario column.
+    """
+    output_cols = [
+        config["reference"],
+        config["period"],
+        config["question_no"],
+        config["target"],
+        "outlier_weight",
+    ]
+
+    scenarios = []
+
+    for scenario, l_values_path in l_values_paths.items():
+        pre_win = join_l_values(
+            df, l_values_path, config["classification_values_path"], config
+        )
+
+        post_win = winsorise_and_derive_weights(pre_win, config)
+
+        post_win = post_win[output_cols].assign(
+            scenario=scenario,
+            winsorised_value=post_win["outlier_weight"] * post_win[config["target"]],
+        )
+
+        scenarios.append(post_win)
+
+    return pd.concat(scenarios, ignore_index=True)
+
+
+def winsorise_and_derive_weights(pre_win: pd.DataFrame, config: dict) -> pd.DataFrame:
+    """
+    Winsorises the component questions, derives the q290 outlier weights from
+    them and applies manual outlier weights.
+
+    Parameters
+    ----------
+    pre_win : pd.DataFrame
+        Dataframe with l values joined.
+    config : dict
+        Config containing column names.
+
+    Returns
+    -------
+    pd.DataFrame
+        Dataframe with outlier weights for all questions.
+    """
     # filtering out q290 since they don't need to be winsorised
     non_290 = pre_win[pre_win[config["question_no"]] != 290]
     q290_rows = pre_win[pre_win[config["question_no"]] == 290]
 
-    post_win = non_290.groupby(config["question_no"])[non_290.columns].apply(
-        lambda df: winsorise(
-            df,
-            config["strata"],
-            config["period"],
-            config["auxiliary"],
-            config["census"],
-            "design_weight",
-            "calibration_factor",
-            config["target"],
-            "l_value",
+    if config.get("outlier_detection_workers"):
+        # Questions are winsorised independently, results are concatenated in
+        # question order so output matches the serial groupby
+        post_win = groupby_apply(
+            non_290,
+            config["question_no"],
+            partial(winsorise_question, config=config),
+            max_workers=config["outlier_detection_workers"],
+            executor=config.get("outlier_detection_executor", "process"),
+        )
+
+    else:
+        post_win = non_290.groupby(config["question_no"])[non_290.columns].apply(
+            lambda df: winsorise_question(df, config)
         )
-    )
 
     # Remove groupby leftovers
     post_win.reset_index(drop=True, inplace=True)
@@ -61,9 +147,34 @@ def detect_outlier(
         config,
     )
 
-    # This is needed for the additional outputs functions
-    post_win["winsorised_value"] = (
-        post_win["outlier_weight"] * post_win["adjustedresponse"]
-    )
-
     return post_win
+
+
+def winsorise_question(df: pd.DataFrame, config: dict) -> pd.DataFrame:
+    """
+    Applies winsorisation to the responses of a single question, defined at
+    module level so it can be sent to a process pool.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe with l values joined, for a single question.
+    config : dict
+        Config containing column names.
+
+    Returns
+    -------
+    pd.DataFrame
+        Winsorised dataframe with outlier weights.
+    """
+    return winsorise(
+        df,
+        config["strata"],
+        config["period"],
+        config["auxiliary"],
+        config["census"],
+        "design_weight",
+        "calibration_factor",
+        config["target"],
+        "l_value",
+    )
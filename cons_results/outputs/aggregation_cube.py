@@ -0,0 +1,151 @@
+import threading
+from typing import List
+
+import pandas as pd
+
+from cons_results.outputs.derived_columns import (
+    flag_returned_or_imputed,
+    get_grossed_value,
+    get_quarter,
+    get_sizeband,
+    grossed_value_column,
+)
+
+GROSSED_VALUE_SUM = "grossed_value_sum"
+
+
+class AggregationCube:
+    """
+    Sums of the grossed values of the components questions at the finest grain
+    used by the aggregated outputs, i.e. by period, quarter, sizeband, question
+    number and returned or imputed. Outputs which are grouped sums over these
+    keys are rolled up from the cube instead of each scanning every row of
+    additional_outputs_df.
+
+    The cube is built the first time it is used, by one thread if outputs are
+    built concurrently, so it is never built if no output uses it.
+
+    Parameters
+    ----------
+    additional_outputs_df : pd.DataFrame
+        Dataframe from get_additional_outputs_df.
+    config : dict
+        main pipeline configuration.
+    keys : List[str], optional
+        Keys of the cube, a subset of the period, "quarter", "sizeband",
+        question number and "returned_or_imputed" columns. The default is None,
+        all of them.
+    value_columns : List[str], optional
+        Columns whose grossed values are summed. The default is None, the target
+        and adjustedresponse columns.
+    """
+
+    def __init__(
+        self,
+        additional_outputs_df: pd.DataFrame,
+        config: dict,
+        keys: List[str] = None,
+        value_columns: List[str] = None,
+    ):
+        self._additional_outputs_df = additional_outputs_df
+        self._config = config
+        self._keys = keys
+        self._value_columns = value_columns
+        self._cube = None
+        self._lock = threading.Lock()
+
+    @property
+    def keys(self) -> List[str]:
+        if self._keys is not None:
+            return self._keys
+
+        return [
+            self._config["period"],
+            "quarter",
+            "sizeband",
+            self._config["question_no"],
+            "returned_or_imputed",
+        ]
+
+    @property
+    def value_columns(self) -> List[str]:
+        if self._value_columns is not None:
+            return self._value_columns
+
+        return list(dict.fromkeys([self._config["target"], "adjustedresponse"]))
+
+    @property
+    def cube(self) -> pd.DataFrame:
+        """Cube with a row per combination of keys, built on first use."""
+        with self._lock:
+            if self._cube is None:
+                self._cube = self._build()
+
+        return self._cube
+
+    def _build(self) -> pd.DataFrame:
+        df = self._additional_outputs_df
+        question_no = self._config["question_no"]
+
+        # selecting only components (so not to include filtered qs with no cell no)
+        df = df[df[question_no].isin(self._config["components_questions"])]
+
+        derive_key = {
+            "quarter": lambda: get_quarter(df, self._config["period"]),
+            "sizeband": lambda: get_sizeband(df, self._config["cell_number"]),
+            "returned_or_imputed": lambda: flag_returned_or_imputed(
+                df["imputation_flags_adjustedresponse"]
+            ),
+        }
+
+        cells = pd.DataFrame(
+            {
+                **{
+                    key: derive_key[key]() if key in derive_key else df[key]
+                    for key in self.keys
+                },
+                **{
+                    grossed_value_column(value_column): get_grossed_value(
+                        df, value_column
+                    )
+                    for value_column in self.value_columns
+                },
+            }
+        )
+
+        # missing keys (e.g. markers which are neither returned nor imputed)
+        # are kept, outputs which do not group by them still include the rows
+        return cells.groupby(self.keys, dropna=False).sum().reset_index()
+
+    def roll_up(
+        self, by: List[str], value_column: str, **filters: list
+    ) -> pd.DataFrame:
+        """
+        Sums the grossed values of a value column of the cube by a subset of its
+        keys.
+
+        Parameters
+        ----------
+        by : List[str]
+            Keys to group by.
+        value_column : str
+            Column whose grossed values are summed, one of value_columns.
+        **filters : list
+            Values to keep for any key, e.g. quarter=["2023Q1"].
+
+        Returns
+        -------
+        pd.DataFrame
+            by columns and the grossed_value_sum column, with a row for each
+            combination of by in the cube, including missing keys.
+        """
+        cube = self.cube
+
+        for key, values in filters.items():
+            cube = cube[cube[key].isin(values)]
+
+        return (
+            cube.groupby(by, dropna=False)[grossed_value_column(value_column)]
+            .sum()
+            .reset_index(name=GROSSED_VALUE_SUM)
+        )
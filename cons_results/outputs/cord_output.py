@@ -3,6 +3,8 @@ import itertools
 import pandas as pd
 from mbs_results.outputs.growth_rates_output import get_growth_rates_output
 
+from cons_results.outputs.derived_columns import derived_output_columns
+
 
 def get_cord_output(
     additional_outputs_df: pd.DataFrame, **config: dict
@@ -22,9 +24,13 @@ def get_cord_output(
     pd.DataFrame
         DataFrame formatted for CORD output.
     """
-    # Filter to only components questions
-    additional_outputs_df = additional_outputs_df[
-        additional_outputs_df["questioncode"].isin(config["components_questions"])
+    # Filter to only components questions, without the shared derived columns
+    # as get_growth_rates_output derives its own (e.g. sizeband)
+    additional_outputs_df = additional_outputs_df.loc[
+        additional_outputs_df["questioncode"].isin(config["components_questions"]),
+        additional_outputs_df.columns.difference(
+            derived_output_columns(config), sort=False
+        ),
     ]
 
     cord_output_df = get_growth_rates_output(additional_outputs_df, **config)
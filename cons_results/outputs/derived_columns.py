@@ -0,0 +1,187 @@
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from cons_results.utilities.periods import period_to_quarter, quarter_to_label
+
+QUARTER = "quarter"
+SIZEBAND = "sizeband"
+
+
+def add_derived_output_columns(df: pd.DataFrame, config: dict) -> pd.DataFrame:
+    """
+    Adds the columns shared by the additional outputs to a copy of df, so they
+    are derived once for all rows instead of by every output on its own copy:
+        - grossed_<value column> : value column multiplied by design weight,
+          outlier weight and calibration factor, for the pounds thousands and
+          target columns, see grossed_value_column.
+        - quarter : quarter of the period in "YYYYQX" format.
+        - sizeband : last digit of the cell number.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe from get_additional_outputs_df.
+    config : dict
+        main pipeline configuration.
+
+    Returns
+    -------
+    pd.DataFrame
+        Copy of df with the derived columns added.
+    """
+    derived_columns = {
+        grossed_value_column(value_column): gross_value(df, value_column)
+        for value_column in [config["pound_thousand_col"], config["target"]]
+    }
+    derived_columns[QUARTER] = derive_quarter(df[config["period"]])
+    derived_columns[SIZEBAND] = derive_sizeband(df[config["cell_number"]])
+
+    return df.assign(**derived_columns)
+
+
+def derived_output_columns(config: dict) -> List[str]:
+    """
+    Names of the columns added by add_derived_output_columns, value columns
+    missing from config (e.g. config of a single output) have no grossed column.
+    """
+    value_columns = dict.fromkeys(
+        config[key] for key in ["pound_thousand_col", "target"] if key in config
+    )
+
+    return [grossed_value_column(column) for column in value_columns] + [
+        QUARTER,
+        SIZEBAND,
+    ]
+
+
+def grossed_value_column(value_column: str) -> str:
+    """Name of the grossed value column of value_column."""
+    return f"grossed_{value_column}"
+
+
+def gross_value(df: pd.DataFrame, value_column: str) -> pd.Series:
+    """
+    Multiplies value_column by design weight, outlier weight and calibration
+    factor.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe with value_column, design_weight, outlier_weight and
+        calibration_factor columns.
+    value_column : str
+        Column name of the values to gross.
+
+    Returns
+    -------
+    pd.Series
+        Grossed values.
+    """
+    return (
+        df[value_column]
+        * df["design_weight"]
+        * df["outlier_weight"]
+        * df["calibration_factor"]
+    )
+
+
+def derive_quarter(period: pd.Series) -> pd.Series:
+    """
+    Quarter of periods in "YYYYMM" format, as "YYYYQX" strings.
+
+    Parameters
+    ----------
+    period : pd.Series
+        Periods in "YYYYMM" format.
+
+    Returns
+    -------
+    pd.Series
+        Quarters in "YYYYQX" format.
+    """
+    quarter = period_to_quarter(period)
+
+    return pd.Series(
+        quarter_to_label(quarter.to_numpy()), index=period.index, name=period.name
+    )
+
+
+def derive_sizeband(cell_number: pd.Series) -> pd.Series:
+    """
+    Sizeband of cell numbers, the last digit of the cell number. Cell numbers
+    are cast to integers first, so float (e.g. 5141.0) and string cell numbers
+    give the same sizeband as integers. Missing cell numbers have a missing
+    sizeband.
+
+    Parameters
+    ----------
+    cell_number : pd.Series
+        Cell numbers, as integers, whole floats or strings of integers.
+
+    Returns
+    -------
+    pd.Series
+        Sizebands, as nullable integers whether or not any are missing.
+    """
+    return cell_number.astype("Int64") % 10
+
+
+def flag_returned_or_imputed(imputation_marker: pd.Series) -> np.ndarray:
+    """
+    Flags imputation markers as "returned" or "imputed", None for any other
+    marker.
+
+    Parameters
+    ----------
+    imputation_marker : pd.Series
+        Imputation markers.
+
+    Returns
+    -------
+    np.ndarray
+        "returned", "imputed" or None for every marker.
+    """
+    return np.where(
+        imputation_marker == "r",
+        "returned",
+        np.where(
+            imputation_marker.isin(["fir", "bir", "mc", "fimc", "fic", "c"]),
+            "imputed",
+            None,  # Use None for missing values instead of np.nan
+        ),
+    )
+
+
+def get_grossed_value(df: pd.DataFrame, value_column: str) -> pd.Series:
+    """
+    Grossed value of value_column, read from df if it was added by
+    add_derived_output_columns, otherwise value_column is grossed.
+    """
+    if grossed_value_column(value_column) in df.columns:
+        return df[grossed_value_column(value_column)]
+
+    return gross_value(df, value_column)
+
+
+def get_quarter(df: pd.DataFrame, period: str) -> pd.Series:
+    """
+    Quarter column of df if it was added by add_derived_output_columns,
+    otherwise it is derived from period.
+    """
+    if QUARTER in df.columns:
+        return df[QUARTER]
+
+    return derive_quarter(df[period])
+
+
+def get_sizeband(df: pd.DataFrame, cell_number: str) -> pd.Series:
+    """
+    Sizeband column of df if it was added by add_derived_output_columns,
+    otherwise it is derived from cell_number.
+    """
+    if SIZEBAND in df.columns:
+        return df[SIZEBAND]
+
+    return derive_sizeband(df[cell_number])
@@ -1,9 +1,14 @@
-import numpy as np
 import pandas as pd
 from mbs_results.utilities.utils import get_versioned_filename
 
+from cons_results.outputs.aggregation_cube import GROSSED_VALUE_SUM, AggregationCube
 
-def get_imputation_contribution_output(additional_outputs_df: pd.DataFrame, **config):
+
+def get_imputation_contribution_output(
+    additional_outputs_df: pd.DataFrame,
+    aggregation_cube: AggregationCube = None,
+    **config,
+):
     """
     Creates imputation contribution output
 
@@ -11,6 +16,9 @@ def get_imputation_contribution_output(additional_outputs_df: pd.DataFrame, **co
     ----------
     df : pd.DataFrame
         Outliering output dataframe with relevant variables for output
+    aggregation_cube : AggregationCube, optional
+        Cube of additional_outputs_df the grossed values are rolled up from. The
+        default is None, a cube of only the keys needed is built.
     config : dict
         A dictionary containing configuration parameters.
     Returns
@@ -21,35 +29,26 @@ def get_imputation_contribution_output(additional_outputs_df: pd.DataFrame, **co
 
     """
 
-    df = additional_outputs_df.copy()
+    question_no = config["question_no"]
+
+    if aggregation_cube is None:
+        aggregation_cube = AggregationCube(
+            additional_outputs_df,
+            config,
+            keys=[config["period"], question_no, "returned_or_imputed"],
+            value_columns=["adjustedresponse"],
+        )
 
+    filters = {}
     if config["imputation_contribution_periods"]:
-        df = df[df[config["period"]].isin(config["imputation_contribution_periods"])]
+        filters[config["period"]] = config["imputation_contribution_periods"]
 
-    question_no = config["question_no"]
+    df = aggregation_cube.roll_up(
+        [question_no, "returned_or_imputed"], "adjustedresponse", **filters
+    ).rename(columns={GROSSED_VALUE_SUM: "curr_grossed_value"})
 
-    df = df[df[question_no].isin(config["components_questions"])]
-
-    df["returned_or_imputed"] = np.where(
-        df["imputation_flags_adjustedresponse"] == "r",
-        "returned",
-        np.where(
-            df["imputation_flags_adjustedresponse"].isin(
-                ["fir", "bir", "mc", "fimc", "fic", "c"]
-            ),
-            "imputed",
-            None,  # Use None for missing values instead of np.nan
-        ),
-    )
-    # Convert adjustedresponse from thousands to millions
-    df["adjustedresponse"] = df["adjustedresponse"] / 1000
-
-    df["curr_grossed_value"] = (
-        df["adjustedresponse"]
-        * df["design_weight"]
-        * df["outlier_weight"]
-        * df["calibration_factor"]
-    )
+    # Convert grossed value from thousands to millions
+    df["curr_grossed_value"] = df["curr_grossed_value"] / 1000
 
     output_df = (
         pd.pivot_table(
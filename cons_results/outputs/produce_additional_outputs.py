@@ -1,18 +1,23 @@
 import logging
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 import pandas as pd
 from mbs_results.outputs.get_additional_outputs import get_additional_outputs
 from mbs_results.utilities.outputs import write_csv_wrapper
 from mbs_results.utilities.utils import get_versioned_filename
 
+from cons_results.outputs.aggregation_cube import AggregationCube
 from cons_results.outputs.cord_output import get_cord_output
+from cons_results.outputs.derived_columns import add_derived_output_columns
 from cons_results.outputs.imputation_contribution_output import (
     get_imputation_contribution_output,
 )
 from cons_results.outputs.imputes_and_constructed_output import (
     get_imputes_and_constructed_output,
 )
-from cons_results.outputs.qa_output import produce_qa_output
+from cons_results.outputs.qa_output import produce_qa_output_by_period
 from cons_results.outputs.quarterly_by_sizeband_output import (
     get_quarterly_by_sizeband_output,
 )
@@ -27,84 +32,230 @@ def produce_additional_outputs(
     optional_outputs: bool,
     config: dict,
 ):
+    """
+    Produces and saves the additional outputs selected by mbs
+    get_additional_outputs. Builders are only bound to their inputs and
+    recorded there by select_output, and are run here, the imputes and
+    constructed output (constructed228, needed for replication) first. Each
+    output is saved as soon as it is built, if additional_outputs_workers is set
+    outputs are built and saved concurrently on a thread pool, the builders only
+    read additional_outputs_df.
+
+    This relies on get_additional_outputs of the monthly-business-survey-results
+    version pinned in setup.cfg calling each selected function_mapper entry as
+    f(additional_outputs_df=..., **config). An error is raised if it returns
+    outputs which were not recorded this way.
+
+    Parameters
+    ----------
+    additional_outputs_df : pd.DataFrame
+        Dataframe from get_additional_outputs_df.
+    qa_outputs : bool
+        Whether to produce the QA outputs.
+    optional_outputs : bool
+        Whether to produce the optional outputs.
+    config : dict
+        main pipeline configuration.
+    """
+
+    # columns used by several outputs are derived once, on a working copy so
+    # they are not added to the caller's dataframe
+    additional_outputs_df = add_derived_output_columns(additional_outputs_df, config)
+
+    # built the first time the sizeband or imputation contribution output is
+    # built and shared between them
+    aggregation_cube = AggregationCube(additional_outputs_df, config)
+
+    selected_builders = {}
 
     additional_outputs = get_additional_outputs(
         config,
         {
-            "imputes_and_constructed_output": get_imputes_and_constructed_output,
-            "quarterly_by_sizeband_output": get_quarterly_by_sizeband_output,
-            "produce_qa_output": produce_qa_output,
-            "imputation_contribution_output": get_imputation_contribution_output,
-            "cord_output": get_cord_output,
-            "r_m_output": produce_r_m_output,
+            output: partial(select_output, selected_builders, output, builder)
+            for output, builder in {
+                "imputes_and_constructed_output": get_imputes_and_constructed_output,
+                "quarterly_by_sizeband_output": partial(
+                    get_quarterly_by_sizeband_output,
+                    aggregation_cube=aggregation_cube,
+                ),
+                "produce_qa_output": produce_qa_output_by_period,
+                "imputation_contribution_output": partial(
+                    get_imputation_contribution_output,
+                    aggregation_cube=aggregation_cube,
+                ),
+                "cord_output": get_cord_output,
+                "r_m_output": produce_r_m_output,
+            }.items()
         },
         additional_outputs_df,
         qa_outputs,
         optional_outputs,
     )
 
-    if additional_outputs is None:
-        return
+    if additional_outputs is not None and not set(additional_outputs).issubset(
+        selected_builders
+    ):
+        raise RuntimeError(
+            "get_additional_outputs returned outputs which were not recorded by "
+            "select_output: "
+            f"{sorted(set(additional_outputs).difference(selected_builders))}, "
+            "check the monthly-business-survey-results version"
+        )
+
+    builders = sorted(
+        selected_builders.items(),
+        key=lambda item: item[0] != "imputes_and_constructed_output",
+    )
+
+    if config.get("additional_outputs_workers"):
+        with ThreadPoolExecutor(
+            max_workers=config["additional_outputs_workers"]
+        ) as pool:
+            futures = [
+                pool.submit(build_and_save_output, output, builder, config)
+                for output, builder in builders
+            ]
+
+            # result raises any exception from building or saving an output
+            for future in futures:
+                future.result()
+
+    else:
+        for output, builder in builders:
+            build_and_save_output(output, builder, config)
+
+
+def select_output(
+    selected_builders: dict,
+    output: str,
+    builder,
+    additional_outputs_df: pd.DataFrame,
+    **config,
+) -> None:
+    """
+    Records an output selected by get_additional_outputs without building it.
+    The builder is bound to its inputs and stored in selected_builders, so
+    produce_additional_outputs does not depend on what get_additional_outputs
+    returns for each output.
+
+    Parameters
+    ----------
+    selected_builders : dict
+        Bound builders of the selected outputs, updated in place.
+    output : str
+        Name of the output.
+    builder : callable
+        Output function, returning a dataframe or a (dataframe, filename) tuple.
+    additional_outputs_df : pd.DataFrame
+        Dataframe from get_additional_outputs_df.
+    **config : dict
+        main pipeline configuration.
+    """
+    selected_builders[output] = partial(builder, additional_outputs_df, **config)
+
+
+def build_and_save_output(output: str, builder, config: dict):
+    """
+    Runs a bound output builder and saves its result.
+
+    Parameters
+    ----------
+    output : str
+        Name of the output.
+    builder : callable
+        Bound builder from select_output.
+    config : dict
+        main pipeline configuration.
+    """
+    result = builder()
+
+    df, name = result if isinstance(result, tuple) else (result, None)
+
+    save_additional_output(output, df, name, config)
 
-    for output, (df, name) in additional_outputs.items():
-        if name:
-            filename = name
-        else:
-            filename = get_versioned_filename(output, config["run_id"])
-
-        if df is not None:
-
-            header = (
-                False
-                if output
-                in [
-                    "quarterly_by_sizeband_output",
-                    "quarterly_extracts",
-                    "produce_qa_output",
-                    "r_m_output",
-                ]
-                else True
-            )
 
-            if isinstance(df, dict):
-                # if the output is a dictionary (e.g. from produce_qa_output),
-                # we need to save each DataFrame in the dictionary
+def save_additional_output(output: str, df, name: str, config: dict):
+    """
+    Saves an additional output, a dictionary of dataframes is saved as one file
+    per key, prefixed with the key, or with its own filename if the value is a
+    (dataframe, filename) tuple.
+
+    Parameters
+    ----------
+    output : str
+        Name of the output.
+    df : pd.DataFrame or dict or Iterator or None
+        Output to save, nothing is saved if None.
+    name : str
+        Filename, if None a versioned filename is created from output.
+    config : dict
+        main pipeline configuration.
+    """
+    if name:
+        filename = name
+    else:
+        filename = get_versioned_filename(output, config["run_id"])
 
-                for name, df in df.items():
+    if df is not None:
+
+        header = (
+            False
+            if output
+            in [
+                "quarterly_by_sizeband_output",
+                "quarterly_extracts",
+                "produce_qa_output",
+                "r_m_output",
+            ]
+            else True
+        )
+
+        if isinstance(df, (dict, Iterator)):
+            # if the output is a dictionary or an iterator of (name, DataFrame)
+            # (e.g. from produce_qa_output_by_period), we need to save each
+            # DataFrame, an iterator builds them one at a time
+
+            for name, df in df.items() if isinstance(df, dict) else df:
+                if isinstance(df, tuple):
+                    # (DataFrame, filename) is saved with its own filename
+                    # (e.g. R&M output of each quarter)
+                    df, output_filename = df[0], config["output_path"] + df[1]
+                else:
                     name = str(name).lower().replace(" ", "_")
                     output_filename = f"{config['output_path']}{name}_{filename}"
-                    write_csv_wrapper(
-                        df,
-                        output_filename,
-                        config["platform"],
-                        config["bucket"],
-                        index=False,
-                        header=header,
-                    )
-
-                    logger.info(output_filename + " saved")
-
-            elif output == "imputes_and_constructed_output":
-                # This needs to output to different location for s3 replication
-                write_csv_wrapper(
-                    df,
-                    config["output_path_replication"] + filename,
-                    config["platform"],
-                    config["bucket"],
-                    index=False,
-                )
-                logger.info(config["output_path_replication"] + filename + " saved")
 
-            else:
                 write_csv_wrapper(
                     df,
-                    config["output_path"] + filename,
+                    output_filename,
                     config["platform"],
                     config["bucket"],
                     index=False,
                     header=header,
                 )
-                logger.info(config["output_path"] + filename + " saved")
+
+                logger.info(output_filename + " saved")
+
+        elif output == "imputes_and_constructed_output":
+            # This needs to output to different location for s3 replication
+            write_csv_wrapper(
+                df,
+                config["output_path_replication"] + filename,
+                config["platform"],
+                config["bucket"],
+                index=False,
+            )
+            logger.info(config["output_path_replication"] + filename + " saved")
+
+        else:
+            write_csv_wrapper(
+                df,
+                config["output_path"] + filename,
+                config["platform"],
+                config["bucket"],
+                index=False,
+                header=header,
+            )
+            logger.info(config["output_path"] + filename + " saved")
 
 
 def get_additional_outputs_df(
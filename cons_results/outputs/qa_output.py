@@ -1,9 +1,11 @@
+from typing import Any, Iterator, Tuple
+
 import pandas as pd
 
+from cons_results.outputs.derived_columns import get_grossed_value
 
-def produce_qa_output(
-    additional_outputs_df: pd.DataFrame, **config: dict
-) -> pd.DataFrame:
+
+def produce_qa_output(additional_outputs_df: pd.DataFrame, **config: dict) -> dict:
     """
     Creates QA output
 
@@ -34,10 +36,37 @@ def produce_qa_output(
 
     Returns
     -------
-    pd.DataFrame
-        QA output dataframe with a MultiIndex on columns, where the first level is
-        question_no and the second level contains value columns such as target,
-        imputation_marker_col,
+    dict
+        QA output dataframes by period with a MultiIndex on columns, where the first
+        level is question_no and the second level contains value columns such as
+        target, imputation_marker_col,
+    """
+
+    return dict(produce_qa_output_by_period(additional_outputs_df, **config))
+
+
+def produce_qa_output_by_period(
+    additional_outputs_df: pd.DataFrame, **config: dict
+) -> Iterator[Tuple[Any, pd.DataFrame]]:
+    """
+    Creates QA output one period at a time, so only a single period is pivoted
+    and held in memory while it is saved. Each period has the columns of a pivot
+    of all periods, i.e. the question and value columns which have a value in
+    any period.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The input DataFrame.
+    config : dict
+        A dictionary containing configuration parameters, see produce_qa_output.
+
+    Yields
+    ------
+    (period, pd.DataFrame)
+        Period and its QA output dataframe with a MultiIndex on columns, where
+        the first level is question_no and the second level contains value
+        columns such as target, imputation_marker_col,
     """
 
     additional_outputs_df = replace_imputation_markers_total_only(
@@ -71,11 +100,8 @@ def produce_qa_output(
     ]
 
     # Create value for adj_targer*a*o*g weights
-    additional_outputs_df["weighted adjusted value"] = (
-        additional_outputs_df[config["pound_thousand_col"]]
-        * additional_outputs_df["design_weight"]
-        * additional_outputs_df["outlier_weight"]
-        * additional_outputs_df["calibration_factor"]
+    additional_outputs_df["weighted adjusted value"] = get_grossed_value(
+        additional_outputs_df, config["pound_thousand_col"]
     )
 
     # selecting 4 value columns
@@ -97,19 +123,29 @@ def produce_qa_output(
         columns={config["pound_thousand_col"]: config["target"]}
     )
 
-    # creating pivot table
-    # Converting question no to string, this becomes a column name
-    # and should be a string
-    qa_output_df = additional_outputs_df.pivot_table(
-        index=index_columns,
-        columns=config["question_no"],
-        values=value_columns,
-        aggfunc="first",
+    # Value and question columns of a pivot of all periods, pivot_table drops
+    # rows with missing keys and columns without any value
+    has_keys = (
+        additional_outputs_df[index_columns + [config["question_no"]]]
+        .notna()
+        .all(axis=1)
     )
-
-    main_pivot = (
-        qa_output_df.swaplevel(axis=1).sort_index(axis=1, level=0).reset_index()
+    has_value = (
+        additional_outputs_df.loc[has_keys, value_columns]
+        .notna()
+        .groupby(additional_outputs_df.loc[has_keys, config["question_no"]])
+        .any()
+    )
+    pivot_columns = pd.MultiIndex.from_tuples(
+        [
+            (value_column, question)
+            for question, row in has_value.iterrows()
+            for value_column in value_columns
+            if row[value_column]
+        ],
+        names=[None, config["question_no"]],
     )
+
     extra_information_columns = [
         config["period"],
         config["reference"],
@@ -118,30 +154,46 @@ def produce_qa_output(
         config["nil_status_col"],
     ]
 
-    extra_information = additional_outputs_df[
-        extra_information_columns
-    ].drop_duplicates(subset=[config["period"], config["reference"]])
-    extra_information.columns = pd.MultiIndex.from_tuples(
-        [(col, "") for col in extra_information.columns]
-    )
-    main_pivot = pd.merge(
-        main_pivot,
-        extra_information.sort_index(axis=1),
-        on=[config["period"], config["reference"]],
-        how="left",
-    )
+    for period, period_df in additional_outputs_df.groupby(config["period"]):
 
-    # convert question_no column names to strings
-    main_pivot.columns = pd.MultiIndex.from_tuples(
-        [(str(l0), l1) for l0, l1 in main_pivot.columns]
-    )
+        # creating pivot table
+        # Converting question no to string, this becomes a column name
+        # and should be a string
+        qa_output_df = period_df.pivot_table(
+            index=index_columns,
+            columns=config["question_no"],
+            values=value_columns,
+            aggfunc="first",
+        )
+
+        if qa_output_df.empty:
+            continue
+
+        qa_output_df = qa_output_df.reindex(columns=pivot_columns)
+
+        main_pivot = (
+            qa_output_df.swaplevel(axis=1).sort_index(axis=1, level=0).reset_index()
+        )
+
+        extra_information = period_df[extra_information_columns].drop_duplicates(
+            subset=[config["period"], config["reference"]]
+        )
+        extra_information.columns = pd.MultiIndex.from_tuples(
+            [(col, "") for col in extra_information.columns]
+        )
+        main_pivot = pd.merge(
+            main_pivot,
+            extra_information.sort_index(axis=1),
+            on=[config["period"], config["reference"]],
+            how="left",
+        )
 
-    period_dict = {
-        period: df.copy()
-        for period, df in main_pivot.groupby(config["period"], dropna=False)
-    }
+        # convert question_no column names to strings
+        main_pivot.columns = pd.MultiIndex.from_tuples(
+            [(str(l0), l1) for l0, l1 in main_pivot.columns]
+        )
 
-    return period_dict
+        yield period, main_pivot
 
 
 def replace_imputation_markers_total_only(
@@ -168,7 +220,8 @@ def replace_imputation_markers_total_only(
     Returns
     -------
     pd.DataFrame
-        The DataFrame with updated imputation markers for eligible rows.
+        A shallow copy of the DataFrame with updated imputation markers for
+        eligible rows, the input DataFrame is not modified.
     """
 
     has_true_290_flag = (
@@ -181,7 +234,12 @@ def replace_imputation_markers_total_only(
 
     mask = has_true_290_flag & imputation_markers_to_change
 
-    df.loc[mask, imputation_marker_col] = df.loc[mask, imputation_marker_col] + suffix
+    # Replacing the whole column of a shallow copy, so the input is not changed
+    imputation_markers = df[imputation_marker_col].copy()
+    imputation_markers[mask] = imputation_markers[mask] + suffix
+
+    df = df.copy(deep=False)
+    df[imputation_marker_col] = imputation_markers
 
     return df
 
@@ -194,6 +252,15 @@ def change_derived_zeros_to_fir(df, imputation_flag_col):
     df : pd.DataFrame
         The input DataFrame.
     imputation_flag_col : str
-        The column name for the imputation flag."""
-    df.loc[df["derived_zeros"] == True, imputation_flag_col] = "fir"  # noqa
+        The column name for the imputation flag.
+
+    Returns
+    -------
+    pd.DataFrame
+        A shallow copy of the DataFrame with updated imputation flags, the input
+        DataFrame is not modified."""
+    df = df.copy(deep=False)
+    df[imputation_flag_col] = df[imputation_flag_col].mask(
+        df["derived_zeros"] == True, "fir"  # noqa
+    )
     return df
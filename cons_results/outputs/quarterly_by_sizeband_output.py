@@ -1,11 +1,14 @@
 import re
 
-import numpy as np
 import pandas as pd
 
+from cons_results.outputs.aggregation_cube import GROSSED_VALUE_SUM, AggregationCube
+
 
 def get_quarterly_by_sizeband_output(
-    additional_outputs_df: pd.DataFrame, **config: dict[str, any]
+    additional_outputs_df: pd.DataFrame,
+    aggregation_cube: AggregationCube = None,
+    **config: dict[str, any],
 ) -> pd.DataFrame:
     """
     Generates a quarterly summary of data grouped by sizeband and question number.
@@ -15,6 +18,9 @@ def get_quarterly_by_sizeband_output(
     additional_outputs_df : pd.DataFrame
         Input DataFrame containing the data to be processed. Must include columns
         specified in the `config` dictionary.
+    aggregation_cube : AggregationCube, optional
+        Cube of additional_outputs_df the weighted values are rolled up from. The
+        default is None, a cube of only the keys needed is built.
     config : dict[str, str]
         Configuration dictionary with the following keys:
             - "period" : str
@@ -41,37 +47,17 @@ def get_quarterly_by_sizeband_output(
             - Columns corresponding to question numbers, with aggregated values for
             each.
     """
-    filtered_data = additional_outputs_df.copy()[
-        [
-            config["period"],
-            config["cell_number"],
-            config["question_no"],
-            config["target"],
-            "design_weight",
-            "outlier_weight",
-            "calibration_factor",
-        ]
-    ]
-
-    filtered_data["weighted_adjustedvalue"] = (
-        filtered_data[config["target"]]
-        * filtered_data["design_weight"]
-        * filtered_data["outlier_weight"]
-        * filtered_data["calibration_factor"]
-    )
-
-    # selecting only components (so not to include filtered qs with no cell no)
-    filtered_data = filtered_data[
-        filtered_data[config["question_no"]].isin(config["components_questions"])
-    ]
-
-    filtered_data["quarter"] = (
-        pd.to_datetime(filtered_data[config["period"]], format="%Y%m")
-        .dt.to_period("Q")
-        .astype(str)
-    )
+    if aggregation_cube is None:
+        aggregation_cube = AggregationCube(
+            additional_outputs_df,
+            config,
+            keys=["quarter", "sizeband", config["question_no"]],
+            value_columns=[config["target"]],
+        )
 
-    filtered_data.drop(columns=[config["period"]], inplace=True)
+    filtered_data = aggregation_cube.roll_up(
+        ["quarter", "sizeband", config["question_no"]], config["target"]
+    ).rename(columns={GROSSED_VALUE_SUM: "weighted_adjustedvalue"})
 
     if config["sizeband_quarter"]:
         pattern = re.compile(r"^\d{4}Q[1-4]$")
@@ -85,13 +71,7 @@ def get_quarterly_by_sizeband_output(
             filtered_data["quarter"].isin(config["sizeband_quarter"])
         ]
 
-    filtered_data["sizeband"] = np.where(
-        filtered_data[config["cell_number"]].isna(),
-        filtered_data[config["cell_number"]],
-        filtered_data[config["cell_number"]].astype(str).str[-1],
-    ).astype(int)
-
-    filtered_data.drop(columns=[config["cell_number"]], inplace=True)
+    filtered_data["sizeband"] = filtered_data["sizeband"].astype(int)
 
     filtered_data.sort_values(
         ["quarter", "sizeband", config["question_no"]],
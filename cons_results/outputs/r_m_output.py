@@ -1,29 +1,51 @@
 import logging
 
+import numpy as np
 import pandas as pd
 from mbs_results.outputs.scottish_welsh_gov_outputs import read_and_combine_ludets_files
 
-logger = logging.getLogger(__name__)
+from cons_results.outputs.derived_columns import get_grossed_value
+from cons_results.utilities.periods import (
+    label_to_quarter,
+    period_to_quarter,
+    quarter_to_label,
+)
 
+logger = logging.getLogger(__name__)
 
-def calculate_regional_employment(
+REGION_TO_CODE = {
+    "Scotland": ["XX"],
+    "Wales": ["WW"],
+    "North East": ["AA"],
+    "North West": ["BB", "BA"],
+    "Yorkshire and The Humber": ["DC"],
+    "East Midlands": ["ED"],
+    "West Midlands": ["FE"],
+    "East of England": ["GF", "GG"],
+    "London": ["HH"],
+    "South East": ["JG"],
+    "South West": ["KJ"],
+}
+
+
+def calculate_regional_shares(
     local_unit_data: pd.DataFrame,
-    region: str,
-    region_code: str,
+    region_to_code: dict = REGION_TO_CODE,
     employment_col: str = "employment",
     region_col: str = "region",
 ) -> pd.DataFrame:
     """
-    Using local unit data to calculate employment for a given region
+    Calculate the share of employment of each reference in every region, from
+    a single grouped sum of local unit employment by reference, period and
+    region.
 
     Parameters
     ----------
     local_unit_data : pd.DataFrame
         local unit data (ludets) read in first part of produce_r_m_output wrapper.
-    region : str
-        name of region to filter by (i.e. "Scotland", "South East")
-    region_code : str
-        Code of region in local unit data, to apply filter.
+    region_to_code : dict, optional
+        Region names and their codes in local unit data. The default is
+        REGION_TO_CODE.
     employment_col : str, optional
         Name of column with employment data in ludets. The default is "employment".
     region_col : str, optional
@@ -31,158 +53,139 @@ def calculate_regional_employment(
 
     Returns
     -------
-    regional_employment : pd.DataFrame
-        Regional employment figures for given region across all references and
-        periods.
-
-    """
-
-    regional_employment = (
-        local_unit_data[local_unit_data[region_col].isin(region_code)]
-        .groupby(["reference", "period"])[employment_col]
-        .sum()
-        .reset_index()
-        .rename(columns={employment_col: f"{employment_col}_{region}"})
-    )
-
-    return regional_employment
-
+    pd.DataFrame
+        Share of total employment indexed by reference and period with a column
+        for each region, nan where a reference has no local units in a region.
 
-def calculate_total_employment(
-    local_unit_data: pd.DataFrame, employment_col: str = "employment"
-):
     """
-    Calculate total employment across all periods in local unit data
 
-    Parameters
-    ----------
-    local_unit_data : pd.DataFrame
-        local unit data (ludets) read in first part of produce_r_m_output wrapper.
-    employment_col : str, optional
-        Name of column with employment data in ludets. The default is "employment".
-
-    Returns
-    -------
-    total_employment : pd.DataFrame
-        Total employment figures by reference and period.
+    code_to_region = {
+        code: region for region, codes in region_to_code.items() for code in codes
+    }
 
-    """
+    total_employment = local_unit_data.groupby(["reference", "period"])[
+        employment_col
+    ].sum()
 
-    total_employment = (
-        local_unit_data.groupby(["reference", "period"])[employment_col]
+    # local units with a region code not in region_to_code count towards total
+    # employment only, they have no region to group by
+    regional_employment = (
+        local_unit_data.groupby(
+            [
+                local_unit_data["reference"],
+                local_unit_data["period"],
+                local_unit_data[region_col].map(code_to_region).rename("region"),
+            ]
+        )[employment_col]
         .sum()
-        .reset_index()
-        .rename(columns={employment_col: "total_employment"})
+        .unstack("region")
+        .reindex(columns=list(region_to_code))
     )
 
-    return total_employment
+    return regional_employment.div(
+        total_employment.reindex(regional_employment.index), axis=0
+    )
 
 
-def calculate_regional_percent(
-    regional_employment: pd.DataFrame,
-    total_employment: pd.DataFrame,
-    region: str,
-    employment_col: str = "employment",
-):
+def apportion_turnover_to_regions(
+    df: pd.DataFrame,
+    regional_shares: pd.DataFrame,
+    region_to_code: dict = REGION_TO_CODE,
+) -> pd.DataFrame:
     """
-    Calculate percent of employees in given region for each reference.
+    Apportion turnover to every region with the regional shares of each
+    reference, joined once and multiplied for all regions at the same time.
+    Where a reference has no share for the region it is assigned to in df (i.e.
+    it has no data in ludets for that region) the share is 100%.
 
     Parameters
     ----------
-    regional_employment : pd.DataFrame
-        Regional employment figures for given region, calculated in
-        `calculate_regional_employment`.
-    total_employment : pd.DataFrame
-        Total employment figures, calculated in `calculate_total_employment`.
-    region : str
-        Name of region.
-    employment_col : str, optional
-        Name of column with employment data in ludets. The default is "employment".
+    df : pd.DataFrame
+        Cons results df with gross_turnover_uk and region columns
+    regional_shares : pd.DataFrame
+        Output from `calculate_regional_shares`.
+    region_to_code : dict, optional
+        Region names and their codes. The default is REGION_TO_CODE.
 
     Returns
     -------
-    merged_df : pd.DataFrame
-        Final output with percentage of employment in given region, calculated
-        from regional and total employment figures.
+    pd.DataFrame
+        Reference, period and questioncode of df with a turnover column for each
+        region.
 
     """
+    regions = list(region_to_code)
 
-    percent_col = f"percentage_{region}"
-
-    merged_df = pd.merge(
-        regional_employment,
-        total_employment,
-        on=["reference", "period"],
-        how="left",
-    )
+    # reindex does not match keys of different dtypes (e.g. int and str
+    # references) and would leave every share missing, so keys are cast to the
+    # dtypes of regional_shares, raising if they cannot be
+    keys = df[["reference", "period"]].astype(regional_shares.index.dtypes.to_dict())
 
-    merged_df[percent_col] = (
-        merged_df[f"{employment_col}_{region}"] / merged_df["total_employment"]
+    shares = (
+        regional_shares.reindex(
+            pd.MultiIndex.from_frame(keys),
+            columns=regions,
+        )
+        .to_numpy(dtype="float64")
+        .copy()
     )
 
-    return merged_df
-
-
-def handle_rus_not_in_ludets(df: pd.DataFrame, region: str, region_code: str):
-    """
-    Helper function called within `calculate_regional_turnover`. If any reference
-    is assigned to one region in df, but has no data in ludets, assign a percentage
-    of 100% to that region.
+    region_position = {
+        code: position
+        for position, region in enumerate(regions)
+        for code in region_to_code[region]
+    }
+    assigned_region = df["region"].map(region_position).fillna(-1).to_numpy()
 
-    """
+    # Set percentage to 100% where region code matches but no data in ludets
+    shares[np.isnan(shares) & (assigned_region[:, None] == np.arange(len(regions)))] = 1
 
-    df.loc[
-        df[f"percentage_{region}"].isnull() & (df["region"].isin(region_code)),
-        f"percentage_{region}",
-    ] = 1
+    turnover = pd.DataFrame(
+        shares * df["gross_turnover_uk"].to_numpy()[:, None],
+        columns=[f"turnover_{region}" for region in regions],
+        index=df.index,
+    )
 
-    return df
+    return pd.concat([df[["reference", "period", "questioncode"]], turnover], axis=1)
 
 
-def calculate_regional_turnover(
-    df: pd.DataFrame, merged_df: pd.DataFrame, region: str, region_code: str
-):
+def reformat_r_m_output(df: pd.DataFrame, **config):
     """
-    Calculating regional proportions of turnover from regional percent and overall
-    turnover figures. Uses result of `calculate_regional_percent`
+    Function to reformat repair and maintenance output. Turnover is summed for each
+    region-question-period combination and arranged in a df with a column for each
+    question.
 
     Parameters
     ----------
     df : pd.DataFrame
-        Cons results df with turnover figure
-    merged_df : pd.DataFrame
-        Output from `calculate_regional_percent`
-    region : str
-        Name of region.
-    region_code : str
-        Code of region.
+        Dataframe with regional proportions calculated for each r+m question
+    **config : dict
+        main pipeline config
 
     Returns
     -------
-    df : pd.DataFrame
-        DataFrame output containing regional proportion of turnover figures.
+    pd.DataFrame
+        Reformatted output
 
     """
 
-    df = df.merge(
-        merged_df[["reference", "period", f"percentage_{region}"]],
-        on=["reference", "period"],
-        how="left",
-    )
-
-    # Set percentage to 100% where region code matches but no data in ludets
-    df = handle_rus_not_in_ludets(df, region, region_code)
+    df["quarter"] = period_to_quarter(df["period"])
+    if config["r_m_quarter"] is None:
+        chosen_quarter = df["quarter"].max()
+    else:
+        chosen_quarter = label_to_quarter(config["r_m_quarter"])
+    df = df[df["quarter"] == chosen_quarter]
 
-    df[f"turnover_{region}"] = df[f"percentage_{region}"] * df["gross_turnover_uk"]
+    df = format_r_m_quarter(pivot_r_m_turnover(df), **config)
 
-    return df
+    return df, quarter_to_label(chosen_quarter)
 
 
-def reformat_r_m_output(df: pd.DataFrame, **config):
+def reformat_r_m_output_all_quarters(df: pd.DataFrame, **config) -> dict:
     """
-    Function to reformat repair and maintenance output. Turnover is summed for each
-    region-question-period combination and arranged in a df with a column for each
-    question.
+    Function to reformat repair and maintenance output for every quarter in df.
+    Turnover of all quarters is summed and pivoted in one pass and then split by
+    quarter, each quarter is the same as `reformat_r_m_output` for that quarter.
 
     Parameters
     ----------
@@ -193,21 +196,30 @@ def reformat_r_m_output(df: pd.DataFrame, **config):
 
     Returns
     -------
-    pd.DataFrame
-        Reformatted output
+    dict
+        Reformatted output of each quarter, keyed by quarter in 'YYYYQX' format.
 
     """
 
-    df["quarter"] = pd.PeriodIndex(
-        pd.to_datetime(df["period"], format="%Y%m"), freq="Q"
-    )
-    if config["r_m_quarter"] is None:
-        chosen_quarter = df["quarter"].max()
-    else:
-        chosen_quarter = pd.Period(config["r_m_quarter"])
-    df = df[df["quarter"] == chosen_quarter]
+    df["quarter"] = period_to_quarter(df["period"])
+
+    df = pivot_r_m_turnover(df)
+
+    # questions without responses in a quarter are not in its output
+    return {
+        quarter: format_r_m_quarter(quarter_df.dropna(how="all", axis=1), **config)
+        for quarter, quarter_df in df.groupby(level="quarter")
+    }
+
+
+def pivot_r_m_turnover(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sums turnover for each quarter-region-question combination, with a column
+    for each question. Called within `reformat_r_m_output` and
+    `reformat_r_m_output_all_quarters`.
+
+    """
 
-    df[["quarter", "questioncode"]] = df[["quarter", "questioncode"]].astype(str)
     df = (
         df.drop(columns=["reference", "period"])
         .groupby(["quarter", "questioncode"])
@@ -215,6 +227,10 @@ def reformat_r_m_output(df: pd.DataFrame, **config):
         .reset_index()
     )
 
+    # only the summed rows are formatted as strings
+    df["quarter"] = quarter_to_label(df["quarter"].to_numpy())
+    df["questioncode"] = df["questioncode"].astype(str)
+
     df = df.melt(
         id_vars=["quarter", "questioncode"],
         value_vars=[col for col in df.columns if col.startswith("turnover")],
@@ -223,20 +239,26 @@ def reformat_r_m_output(df: pd.DataFrame, **config):
     )
     df["region"] = df["region"].str.replace("turnover_", "")
 
-    df = (
-        df.pivot_table(
-            index=["quarter", "region"], columns="questioncode", values="turnover"
-        )
-        .sort_values(
-            by=["region"],
-            key=lambda x: x.map(config["r_m_region_order"]),
-        )
-        .reset_index()
+    return df.pivot_table(
+        index=["quarter", "region"], columns="questioncode", values="turnover"
     )
 
+
+def format_r_m_quarter(df: pd.DataFrame, **config) -> pd.DataFrame:
+    """
+    Orders the regions of a quarter of `pivot_r_m_turnover` and names its
+    question columns.
+
+    """
+
+    df = df.sort_values(
+        by=["region"],
+        key=lambda x: x.map(config["r_m_region_order"]),
+    ).reset_index()
+
     df = df.fillna(0).rename(columns=config["question_no_plaintext"])
 
-    return df.rename_axis(None, axis=1), str(chosen_quarter)
+    return df.rename_axis(None, axis=1)
 
 
 def produce_r_m_output(additional_outputs_df: pd.DataFrame, **config):
@@ -253,9 +275,12 @@ def produce_r_m_output(additional_outputs_df: pd.DataFrame, **config):
 
     Returns
     -------
-    pd.DataFrame
-        Completed R+M output, with each question summarised by region and quarterly
-        period.
+    tuple or None
+        (pd.DataFrame, str), completed R+M output, with each question summarised
+        by region and quarterly period, and its filename. If r_m_all_quarters is
+        set in config, (dict, None) where the dictionary maps every quarter in the
+        data to its (pd.DataFrame, str) output and filename, ludets are read once
+        for all quarters. None if produce_r_m_output is not True in config.
 
     """
 
@@ -269,56 +294,36 @@ def produce_r_m_output(additional_outputs_df: pd.DataFrame, **config):
         return None
 
     df = additional_outputs_df[
-        [
-            "reference",
-            "period",
-            "questioncode",
-            "adjustedresponse_pounds_thousands",
-            "region",
-            "design_weight",
-            "calibration_factor",
-            "outlier_weight",
-        ]
+        additional_outputs_df["questioncode"].isin(config["r_m_questions"])
     ]
-    df = df[df["questioncode"].isin(config["r_m_questions"])]
+    df = df[["reference", "period", "questioncode", "region"]].assign(
+        gross_turnover_uk=get_grossed_value(df, "adjustedresponse_pounds_thousands")
+    )
 
     # TODO: Replace with dedicated cons functions
     ludets = read_and_combine_ludets_files(config)
     ludets["reference"] = ludets["ruref"]
-    total_employment = calculate_total_employment(ludets)
-
-    region_to_code = {
-        "Scotland": ["XX"],
-        "Wales": ["WW"],
-        "North East": ["AA"],
-        "North West": ["BB", "BA"],
-        "Yorkshire and The Humber": ["DC"],
-        "East Midlands": ["ED"],
-        "West Midlands": ["FE"],
-        "East of England": ["GF", "GG"],
-        "London": ["HH"],
-        "South East": ["JG"],
-        "South West": ["KJ"],
-    }
+    regional_shares = calculate_regional_shares(ludets)
 
-    df["gross_turnover_uk"] = (
-        df["adjustedresponse_pounds_thousands"]
-        * df["design_weight"]
-        * df["outlier_weight"]
-        * df["calibration_factor"]
-    )
+    df = apportion_turnover_to_regions(df, regional_shares)
 
-    for region in region_to_code.keys():
-        region_code = region_to_code[region]
-        logger.info(f"Filtering for {region} with region code {region_code}")
-        regional_employment = calculate_regional_employment(ludets, region, region_code)
-        merged_df = calculate_regional_percent(
-            regional_employment, total_employment, region
+    if config.get("r_m_all_quarters"):
+        # saved as one file per quarter, named as the output of that quarter
+        df = reformat_r_m_output_all_quarters(df, **config)
+
+        return (
+            {
+                quarter: (quarter_df, get_r_m_filename(quarter, config["run_id"]))
+                for quarter, quarter_df in df.items()
+            },
+            None,
         )
-        df = calculate_regional_turnover(df, merged_df, region, region_code)
 
     df, quarter = reformat_r_m_output(df, **config)
 
-    filename = f"r_and_m_regional_extracts_{quarter}_{config['run_id']}.csv"
+    return (df, get_r_m_filename(quarter, config["run_id"]))
+
 
-    return (df, filename)
+def get_r_m_filename(quarter: str, run_id: str) -> str:
+    """Filename of the R+M output of a quarter in 'YYYYQX' format."""
+    return f"r_and_m_regional_extracts_{quarter}_{run_id}.csv"
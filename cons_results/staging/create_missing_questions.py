@@ -24,6 +24,11 @@ def create_missing_questions(
 
         If a reference has never responded then generate all possible questions
 
+    Expected questions are held as an integer bitmask per reference and period,
+    with one bit for each question in components_questions + [290] (and any extra
+    questions in manual constructions), so forward filling and combining with
+    manual constructions are integer operations rather than operations on lists.
+
     Period must be sortable in correct order, this is fine if dtype is datetime
     or integer,str in a format which can be sorted, e,g, yyyymm. This will not
     work if date is in mmyyyy.
@@ -36,6 +41,10 @@ def create_missing_questions(
     contributors : pd.DataFrame
         Dataframe containing contributors.
         Reference,period unique identifiers in contributors.
+    manual_constructions : pd.DataFrame
+        Dataframe containing manual constructions or None. Questions constructed
+        for a reference are expected in that period and are forward filled to
+        later periods.
     components_questions: List[int]
         List of components_question codes which are expected in the responses.
     reference : str
@@ -91,115 +100,234 @@ def create_missing_questions(
     """
 
     all_questions = components_questions + [290]
+    flag_cols = ["290_flag", "is_total_only_and_zero"]
 
-    contributors = contributors.set_index([reference, period]).index
-
-    responses_questions = (
-        responses.groupby([reference, period])[question_col].apply(list).to_frame()
-    )
-
-    q290 = responses.copy()
-    q290 = q290[q290[question_col] == 290].set_index([reference, period])[
-        ["290_flag", "is_total_only_and_zero"]
-    ]
+    # Each question gets a bit, manual constructions can add questions which
+    # are not expected so these get a bit too
+    manual_questions = []
+    if isinstance(manual_constructions, pd.DataFrame):
+        manual_questions = sorted(
+            set(manual_constructions[question_col].unique()) - set(all_questions)
+        )
 
-    responses_questions = pd.concat([responses_questions, q290], axis=1)
+    question_bits = pd.Index(all_questions + manual_questions)
 
-    responses_questions.loc[
-        (responses_questions["290_flag"])
-        | (responses_questions["is_total_only_and_zero"]),
-        question_col,
-    ] = np.nan
+    if len(question_bits) > 63:
+        raise ValueError(
+            f"{len(question_bits)} questions can not be represented in a 64 bit mask"
+        )
 
-    responses_questions[question_col] = responses_questions[question_col].fillna(
-        {row: all_questions for row in responses_questions.index}
-    )
+    all_questions_mask = questions_to_bitmask(all_questions, question_bits).sum()
+    components_mask = questions_to_bitmask(components_questions, question_bits).sum()
+    total_mask = questions_to_bitmask([290], question_bits).sum()
 
-    # Creating a new column to save list of questions to be created
-    responses_questions["missing_questions_helper"] = (
-        responses_questions[question_col]
-        .map(set(components_questions).intersection)
-        .map(list)
+    # One row per reference and period in contributors, sorted for ffill
+    expected_responses = (
+        contributors[[reference, period]]
+        .sort_values([reference, period], kind="stable")
+        .reset_index(drop=True)
     )
+    expected_index = pd.MultiIndex.from_frame(expected_responses)
 
-    # Sorting first by reference and then by period, for ffill
-    expected_responses = (
-        responses_questions.reindex(contributors)
-        .reset_index()
-        .sort_values([reference, period])
+    # Bitmask of returned questions and 290 flags for each responder. Rows are
+    # unique per question so the sum of bits is the same as bitwise or
+    responses_questions = (
+        responses[[reference, period]]
+        .assign(
+            question_mask=questions_to_bitmask(responses[question_col], question_bits),
+            **{
+                flag: (responses[question_col] == 290) & responses[flag]
+                for flag in flag_cols
+            },
+        )
+        .groupby([reference, period], sort=False)
+        .agg(
+            {"question_mask": "sum", "290_flag": "any", "is_total_only_and_zero": "any"}
+        )
     )
 
-    expected_responses["missing_questions_helper"] = expected_responses.groupby(
-        [reference]
-    )["missing_questions_helper"].ffill()
+    responder_position = responses_questions.index.get_indexer(expected_index)
+    has_responded = responder_position >= 0
 
-    expected_responses["missing_questions_helper"] = expected_responses[
-        "missing_questions_helper"
-    ].fillna({row: components_questions for row in expected_responses.index})
+    # Non responders have position -1 which takes the appended default
+    returned_mask = np.append(responses_questions["question_mask"].to_numpy(), 0)[
+        responder_position
+    ]
+    flags = {
+        flag: np.append(responses_questions[flag].to_numpy(), False)[responder_position]
+        for flag in flag_cols
+    }
+
+    # Special 290 cases are expected to have all questions
+    is_flagged = flags["290_flag"] | flags["is_total_only_and_zero"]
+    returned_mask = np.where(is_flagged, all_questions_mask, returned_mask)
+
+    # If a reference has not responded in a specific period then look to prior
+    # period, if it has never responded then expect all components
+    expected_mask = forward_fill_by_reference(
+        returned_mask & components_mask,
+        has_responded,
+        expected_responses[reference].to_numpy(),
+        fill_value=components_mask,
+    )
 
     # Handling expected questions when they exist in manual constructions
     # it adds the manual constructions to expected questions and forwards fill
     if isinstance(manual_constructions, pd.DataFrame):
-
-        man_helper = (
-            manual_constructions.groupby([reference, period])[question_col]
-            .apply(list)
-            .to_frame()
-        ).reset_index()
-        expected_responses = expected_responses.merge(
-            man_helper, on=[reference, period], how="left", suffixes=("", "_man")
+        manual_questions_mask = (
+            manual_constructions[[reference, period]]
+            .assign(
+                question_mask=questions_to_bitmask(
+                    manual_constructions[question_col], question_bits
+                )
+            )
+            .groupby([reference, period], sort=False)["question_mask"]
+            .sum()
         )
+        manual_position = manual_questions_mask.index.get_indexer(expected_index)
 
-        expected_responses[f"{question_col}_man"] = expected_responses.groupby(
-            [reference]
-        )[f"{question_col}_man"].ffill()
-
-        # filling na with empty list to allow concating of 2 lists on next step
-        expected_responses[f"{question_col}_man"] = (
-            expected_responses[f"{question_col}_man"].fillna("").apply(list)
+        expected_mask |= forward_fill_by_reference(
+            np.append(manual_questions_mask.to_numpy(), 0)[manual_position],
+            manual_position >= 0,
+            expected_responses[reference].to_numpy(),
+            fill_value=0,
         )
 
-        expected_responses["missing_questions_helper"] = expected_responses.apply(
-            lambda row: list(
-                set(row["missing_questions_helper"] + row[f"{question_col}_man"])
-            ),
-            axis=1,
-        )
+    # Responders keep the questions they returned
+    expected_mask = np.where(has_responded, returned_mask, expected_mask)
+    expected_mask = np.where(flags["is_total_only_and_zero"], total_mask, expected_mask)
 
-    # question col now has list of questions which were in the responses
-    # if question col is na it means that it was missing and we should use the
-    # list of questions in filling_helper column
+    # Rows of responders which are not special 290 cases are kept as they are,
+    # all others are generated from the expected questions bitmask
+    response_position = expected_index.get_indexer(
+        pd.MultiIndex.from_frame(responses[[reference, period]])
+    )
+    keep_response = response_position >= 0
+    keep_response[keep_response] = ~is_flagged[response_position[keep_response]]
 
-    expected_responses[question_col] = expected_responses[question_col].fillna(
-        expected_responses["missing_questions_helper"]
+    generate_mask = np.where(~has_responded | is_flagged, expected_mask, 0)
+    group_position, question_position = bitmask_to_positions(
+        generate_mask, len(question_bits)
     )
 
-    # We only have NAs for non-responders which should have False for 290_flag
-    expected_responses["290_flag"] = (
-        expected_responses["290_flag"].fillna(0).astype(bool)
+    expected_rows = pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    "group_position": response_position[keep_response],
+                    question_col: responses.loc[keep_response, question_col].to_numpy(),
+                }
+            ),
+            pd.DataFrame(
+                {
+                    "group_position": group_position,
+                    question_col: question_bits[question_position],
+                }
+            ),
+        ],
+        ignore_index=True,
+    ).sort_values("group_position", kind="stable")
+
+    expected_positions = expected_rows["group_position"].to_numpy()
+
+    expected_rows = pd.DataFrame(
+        {
+            reference: expected_responses[reference].to_numpy()[expected_positions],
+            period: expected_responses[period].to_numpy()[expected_positions],
+            question_col: expected_rows[question_col].to_numpy(),
+            **{flag: flags[flag][expected_positions] for flag in flag_cols},
+        }
     )
 
-    expected_responses["is_total_only_and_zero"] = (
-        expected_responses["is_total_only_and_zero"].fillna(0).astype(bool)
+    responses_full = expected_rows.merge(
+        responses.drop(columns=flag_cols),
+        on=[reference, period, question_col],
+        how="left",
     )
 
-    expected_responses.loc[
-        expected_responses["is_total_only_and_zero"], question_col
-    ] = 290
+    return responses_full
 
-    expected_responses = expected_responses.explode(question_col, ignore_index=True)
 
-    expected_rows_index = expected_responses.set_index(
-        [reference, period, question_col, "290_flag", "is_total_only_and_zero"]
-    ).index
+def questions_to_bitmask(questions, question_bits: pd.Index) -> np.ndarray:
+    """
+    Converts question codes to their bit in a question bitmask, question codes
+    which are not in question_bits are converted to 0.
 
-    responses = responses.set_index(
-        [reference, period, question_col, "290_flag", "is_total_only_and_zero"]
-    )
+    Parameters
+    ----------
+    questions : array-like
+        Question codes to convert.
+    question_bits : pd.Index
+        Question codes ordered by their bit position.
+
+    Returns
+    -------
+    np.ndarray
+        Array of int64 with a single bit set for each known question.
+    """
+    positions = question_bits.get_indexer(questions)
 
-    responses_full = responses.reindex(expected_rows_index).reset_index()
+    return np.where(
+        positions >= 0, np.left_shift(1, positions, dtype=np.int64), 0
+    ).astype(np.int64)
 
-    return responses_full
+
+def bitmask_to_positions(masks: np.ndarray, n_bits: int) -> (np.ndarray, np.ndarray):
+    """
+    Expands an array of bitmasks to the positions of their set bits.
+
+    Parameters
+    ----------
+    masks : np.ndarray
+        Array of int64 bitmasks.
+    n_bits : int
+        Number of bits used in the masks.
+
+    Returns
+    -------
+    (np.ndarray, np.ndarray)
+        Index of the mask and bit position of each set bit, ordered by mask
+        and then by bit position.
+    """
+    is_set = (masks[:, None] >> np.arange(n_bits, dtype=np.int64)) & 1
+
+    return np.nonzero(is_set)
+
+
+def forward_fill_by_reference(
+    values: np.ndarray, valid: np.ndarray, references: np.ndarray, fill_value: int
+) -> np.ndarray:
+    """
+    Forward fills values within each reference, values must be sorted by
+    reference and then by period.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Values to forward fill, only used where valid is True.
+    valid : np.ndarray
+        Bool array, False marks the values to be filled.
+    references : np.ndarray
+        References of the values, used to stop filling across references.
+    fill_value : int
+        Value used where there is no prior valid value for the reference.
+
+    Returns
+    -------
+    np.ndarray
+        Forward filled values.
+    """
+    row_number = np.arange(len(values))
+
+    is_first_row = np.ones(len(values), dtype=bool)
+    is_first_row[1:] = references[1:] != references[:-1]
+    first_row = np.maximum.accumulate(np.where(is_first_row, row_number, 0))
+
+    last_valid_row = np.maximum.accumulate(np.where(valid, row_number, -1))
+
+    return np.where(
+        last_valid_row >= first_row, values[last_valid_row], fill_value
+    ).astype(np.int64)
 
 
 def convert_values(
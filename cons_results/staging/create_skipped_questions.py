@@ -59,77 +59,44 @@ def create_skipped_questions(
         questions exist in input dataframe.
 
     """
-    df_filtered = df.loc[df[status_col].isin(status_filter)].copy()
+    status_mask = df[status_col].isin(status_filter)
+    df_filtered = df.loc[status_mask]
 
-    # getting list of all references and period combinations
-    df_filtered_index = (
-        df_filtered[["reference", "period"]]
+    # Every reference and period combination in the filter is expected to have
+    # all questions, the cross product gives the full set of expected rows
+    expected_rows = (
+        df_filtered[[reference, period]]
         .drop_duplicates()
-        .set_index([reference, period])
-        .index
+        .merge(pd.DataFrame({question_col: all_questions}), how="cross")
     )
 
-    responses_questions = (
-        df_filtered.groupby([reference, period])[question_col].apply(list).to_frame()
+    # Anti-join against existing rows, what is left are the skipped questions
+    existing_rows = pd.MultiIndex.from_frame(
+        df_filtered[[reference, period, question_col]]
     )
+    skipped_rows = expected_rows.loc[
+        ~pd.MultiIndex.from_frame(expected_rows).isin(existing_rows)
+    ]
 
-    # Creating a new column to save list of questions to be created
-    responses_questions["skipped_question_col"] = responses_questions[question_col].map(
-        lambda x: list(set(all_questions) - set(x))
-    )
+    responses_full = df_filtered.assign(**{flag_col_name: False})
 
-    # Sorting first by reference and then by period, for ffill
-    expected_responses = (
-        responses_questions.reindex(df_filtered_index)
-        .reset_index()
-        .sort_values([reference, period])
-    )
+    if not skipped_rows.empty:
+        responses_full = pd.concat(
+            [responses_full, skipped_rows.assign(**{flag_col_name: True})]
+        )
 
-    expected_responses["skipped_question_col"] = expected_responses[
-        "skipped_question_col"
-    ].fillna({row: all_questions for row in expected_responses.index})
-
-    # question col now has list of questions which were in the responses
-    # if question col is na it means that it was missing and we should use the
-    # list of questions in filling_helper column
-
-    # Combine the original and missing questions lists for each row
-    expected_responses[question_col] = expected_responses.apply(
-        lambda row: (row[question_col] if isinstance(row[question_col], list) else [])
-        + (
-            row["skipped_question_col"]
-            if isinstance(row["skipped_question_col"], list)
-            else []
-        ),
-        axis=1,
+    # Stable sort keeps existing rows ahead of created rows within each
+    # reference and period, this is needed for ffill
+    responses_full = responses_full.sort_values(
+        [reference, period], kind="stable", ignore_index=True
     )
 
-    expected_responses = expected_responses.explode(question_col, ignore_index=True)
-    # resetting type for created column ready for join
-    expected_responses[question_col] = expected_responses[question_col].astype(int)
-
-    expected_rows_index = expected_responses.set_index(
-        [reference, period, question_col]
-    ).index
-
-    responses = df.set_index([reference, period, question_col])
-
-    responses_full = responses.reindex(expected_rows_index).reset_index()
-
-    # Best way to flag these newly created skipped questions at the moment.
-    responses_full = responses_full.merge(
-        expected_responses[[reference, period, question_col, "skipped_question_col"]],
-        on=[reference, period, question_col],
-        how="left",
-    )
-    # Assign column true if question no is found in skipped_question_col
-    responses_full[flag_col_name] = responses_full.apply(
-        lambda row: row[question_col] in row["skipped_question_col"]
-        if isinstance(row["skipped_question_col"], list)
-        else False,
-        axis=1,
-    )
-    responses_full = responses_full.drop(columns=["skipped_question_col"])
+    key_columns = [reference, period, question_col]
+    responses_full = responses_full[
+        key_columns
+        + [col for col in df.columns if col not in key_columns]
+        + [flag_col_name]
+    ]
 
     responses_full = fill_columns_in_created_questions(
         responses_full,
@@ -144,9 +111,7 @@ def create_skipped_questions(
         flag_col_name,
     )
 
-    df_unfiltered = df.loc[~df[status_col].isin(status_filter)].copy()
-
-    df_unfiltered[flag_col_name] = False
+    df_unfiltered = df.loc[~status_mask].assign(**{flag_col_name: False})
 
     responses_full = pd.concat([responses_full, df_unfiltered], axis=0)
 
@@ -1,3 +1,6 @@
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 
 
@@ -60,17 +63,26 @@ def derive_imputation_class(
  lower and upper bounds"""
         )
 
-    # pd.IntervalIndex expects a list of tuples with upper lower bands
-    bands_list_tuples = [tuple(x) for x in sizebands.values()]
-
-    bins = pd.IntervalIndex.from_tuples(bands_list_tuples, closed)
+    lower_bounds, upper_bounds, imputation_classes = imputation_class_lookup(
+        tuple((label, tuple(bounds)) for label, bounds in sizebands.items()), closed
+    )
 
-    col_with_bins = pd.cut(df[column].to_list(), bins)
+    # Classes are looked up once for each distinct value and then taken for
+    # every row, codes of -1 (missing values) take the appended nan
+    codes, uniques = pd.factorize(df[column])
+    uniques = np.asarray(uniques, dtype=float)
 
-    df[save_bins_col_name] = col_with_bins.rename_categories(sizebands.keys()).astype(
-        float
+    side = "right" if closed in ["left", "both"] else "left"
+    band = np.searchsorted(lower_bounds, uniques, side=side) - 1
+    upper = upper_bounds[np.maximum(band, 0)]
+    in_band = (band >= 0) & (
+        uniques <= upper if closed in ["right", "both"] else uniques < upper
     )
 
+    unique_classes = np.where(in_band, imputation_classes[np.maximum(band, 0)], np.nan)
+
+    df[save_bins_col_name] = np.append(unique_classes, np.nan)[codes]
+
     # TODO: discuss logging, raising, debugging strategy
     if df[save_bins_col_name].hasnans:
 
@@ -79,3 +91,44 @@ def derive_imputation_class(
         )
 
     return df
+
+
+@lru_cache(maxsize=None)
+def imputation_class_lookup(
+    sizebands: tuple, closed: str = "both"
+) -> (np.ndarray, np.ndarray, np.ndarray):
+    """
+    Builds the lookup used by derive_imputation_class, this is cached so it is
+    only built once for each bands config.
+
+    Parameters
+    ----------
+    sizebands : tuple
+        Tuple of (label, (lower, upper)) pairs, built from the bands dictionary.
+    closed : str, optional
+        Arg passed to pandas.IntervalIndex, accepted values are left, right,
+        both, neither. The default is "both".
+
+    Returns
+    -------
+    (np.ndarray, np.ndarray, np.ndarray)
+        Lower bounds, upper bounds and imputation classes of the bands, sorted
+        by lower bound.
+
+    Raises
+    ------
+    ValueError
+        If the bands overlap.
+    """
+    bins = pd.IntervalIndex.from_tuples([bounds for _, bounds in sizebands], closed)
+
+    if bins.is_overlapping:
+        raise ValueError("Overlapping IntervalIndex is not accepted.")
+
+    order = np.argsort(bins.left, kind="stable")
+
+    return (
+        np.asarray(bins.left, dtype=float)[order],
+        np.asarray(bins.right, dtype=float)[order],
+        np.array([float(label) for label, _ in sizebands])[order],
+    )
@@ -3,6 +3,8 @@ from typing import List
 import pandas as pd
 from mbs_results.utilities.utils import convert_column_to_datetime
 
+from cons_results.utilities.joins import partition_by_keys
+
 
 def run_live_or_frozen(
     responses: pd.DataFrame,
@@ -21,7 +23,10 @@ def run_live_or_frozen(
     For frozen contributors in error are treated as non-response and dropped
     from responses, exporting the responses in error as a seperate dataframe.
 
-    For live returning original responses dataframe and empty
+    Responses in error are found with a keyed semi-join on period and
+    reference, so responses keep their columns, dtypes and order.
+
+    For live returning original responses dataframe (not a copy) and empty
     frozen_responses_in_error. Note that frozen_responses_in_error will be
     merged again to respones in staging so initiliasing it with required columns.
 
@@ -30,7 +35,8 @@ def run_live_or_frozen(
     responses : pd.DataFrame
         Dataframe with responses.
     contributors : pd.DataFrame
-        Dataframe with contributors.
+        Dataframe with contributors, if None then responses must already have
+        the status column.
     target : str or list[str]
         Column(s) to treat as non-response.
     period : str
@@ -63,8 +69,6 @@ def run_live_or_frozen(
         Original responses witj contributors in error.
     """
 
-    responses = responses.copy()
-
     if state not in ["frozen", "live"]:
         raise ValueError(
             """{} is not an accepted state status, use either frozen or live """.format(
@@ -84,28 +88,28 @@ def run_live_or_frozen(
 
     if state == "frozen":
 
-        con_in_error = contributors.loc[
-            (contributors[status].isin(error_values))
-            & (contributors[period] != backdata_period)
-        ]
-
-        con_in_error = con_in_error[[period, reference]]
-
-        responses = responses.merge(con_in_error, how="outer", indicator=True)
+        if contributors is None:
+            in_error = (responses[status].isin(error_values)) & (
+                responses[period] != backdata_period
+            )
 
-        frozen_responses_in_error = responses[(responses._merge == "both")].copy()
+            responses_in_error, responses = responses[in_error], responses[~in_error]
 
-        frozen_responses_in_error[f"live_{target}"] = frozen_responses_in_error[
-            target
-        ].copy()
+        else:
+            con_in_error = contributors.loc[
+                (contributors[status].isin(error_values))
+                & (contributors[period] != backdata_period)
+            ]
 
-        frozen_responses_in_error = frozen_responses_in_error[
-            [reference, period, question_no, f"live_{target}"]
-        ]
+            responses_in_error, responses = partition_by_keys(
+                responses, con_in_error, [period, reference]
+            )
 
-        responses = responses[(responses._merge == "left_only")].drop("_merge", axis=1)
+        frozen_responses_in_error = responses_in_error[
+            [reference, period, question_no, target]
+        ].rename(columns={target: f"live_{target}"})
 
-        responses.reset_index(drop=True, inplace=True)
-        frozen_responses_in_error.reset_index(drop=True, inplace=True)
+        responses = responses.reset_index(drop=True)
+        frozen_responses_in_error = frozen_responses_in_error.reset_index(drop=True)
 
     return responses, frozen_responses_in_error
@@ -1,4 +1,5 @@
 import logging
+from typing import List
 
 import numpy as np
 import pandas as pd
@@ -126,9 +127,17 @@ def stage_dataframe(config: dict) -> pd.DataFrame:
         how="outer",
     )
 
+    # Join contributor statuses to responses once, the flags below share this
+    # view instead of each merging responses with contributors
+    status_cols = list(dict.fromkeys(["status", staging_config["status"]]))
+
+    responses = join_contributor_status(
+        responses, contributors, period, reference, status_cols
+    )
+
     responses, frozen_responses_in_error = run_live_or_frozen(
         responses=responses,
-        contributors=contributors,
+        contributors=None,
         period="period",
         reference="reference",
         question_no="questioncode",
@@ -142,7 +151,7 @@ def stage_dataframe(config: dict) -> pd.DataFrame:
 
     responses = flag_290_case(
         responses,
-        contributors,
+        None,
         staging_config["period"],
         staging_config["reference"],
         staging_config["question_no"],
@@ -151,7 +160,7 @@ def stage_dataframe(config: dict) -> pd.DataFrame:
 
     responses = flag_total_only_and_zero(
         responses,
-        contributors,
+        None,
         staging_config["reference"],
         staging_config["period"],
         staging_config["target"],
@@ -159,6 +168,8 @@ def stage_dataframe(config: dict) -> pd.DataFrame:
         config["clear_statuses"],
     )
 
+    responses = responses.drop(columns=status_cols)
+
     if staging_config["manual_constructions_path"]:
         manual_constructions = read_csv_wrapper(
             staging_config["manual_constructions_path"],
@@ -260,6 +271,45 @@ def stage_dataframe(config: dict) -> pd.DataFrame:
     return df, unprocessed_data, manual_constructions, filter_df
 
 
+def join_contributor_status(
+    responses: pd.DataFrame,
+    contributors: pd.DataFrame,
+    period: str,
+    reference: str,
+    status_cols: List[str],
+) -> pd.DataFrame:
+    """
+    Joins contributor status columns onto responses. Staging flags which need the
+    status of a contributor can be given this view with contributors as None, so
+    responses are only merged with contributors once.
+
+    Parameters
+    ----------
+    responses : pd.DataFrame
+        Dataframe containing responses.
+    contributors : pd.DataFrame
+        Dataframe containing contributors, unique on period and reference.
+    period : str
+        Column name containing period variable.
+    reference : str
+        Column name containing reference variable.
+    status_cols : List[str]
+        Contributor columns to join onto responses.
+
+    Returns
+    -------
+    pd.DataFrame
+        Responses with status_cols joined from contributors.
+    """
+
+    return responses.merge(
+        contributors[[period, reference] + status_cols],
+        how="left",
+        on=[period, reference],
+        validate="many_to_one",
+    )
+
+
 def flag_290_case(
     responses: pd.DataFrame,
     contributors: pd.DataFrame,
@@ -278,7 +328,8 @@ def flag_290_case(
     responses : pd.Dataframe
         Input responses DataFrame which has unflagged 290 special cases.
     contributors : pd.Dataframe
-        Input contributors dataframe
+        Input contributors dataframe, if None then responses must already have
+        the status column (see join_contributor_status).
     period : str
         Column name containing period variable.
     reference : str
@@ -294,43 +345,43 @@ def flag_290_case(
         Output DataFrame with variable that flags 290 special cases.
     """
 
-    df = responses.merge(contributors, how="left", on=["period", "reference"]).copy()
-    df = df[df["status"].isin(["Clear - overridden", "Clear"])]
-
-    # Group and sum adjusted responses for question 290
-    question_290_df = (
-        df[df[question_no] == 290].groupby([period, reference])[adjusted_response].sum()
+    if contributors is None:
+        df = responses
+    else:
+        df = responses.merge(contributors, how="left", on=["period", "reference"])
+
+    is_290 = (df[question_no] == 290).to_numpy()
+    values = df[adjusted_response].fillna(0).to_numpy()
+
+    # One grouped pass for the 290 total and the sum of all other questions
+    group_sums = (
+        pd.DataFrame(
+            {
+                period: df[period].to_numpy(),
+                reference: df[reference].to_numpy(),
+                "q290_count": is_290,
+                "q290_sum": np.where(is_290, values, 0),
+                "other_questions_count": ~is_290,
+                "other_questions_sum": np.where(is_290, 0, values),
+            }
+        )
+        .groupby([period, reference], sort=False)
+        .transform("sum")
     )
 
-    # Group and sum adjusted responses for all other questions
-    other_questions_df = (
-        df[df[question_no] != 290].groupby([period, reference])[adjusted_response].sum()
+    # Flag pairs of period and reference numbers where 290 is given and other
+    # questions are not given or sum to zero when 290 is not zero
+    is_290_case = (group_sums["q290_count"] > 0) & (
+        (group_sums["other_questions_count"] == 0)
+        | ((group_sums["other_questions_sum"] == 0) & (group_sums["q290_sum"] != 0))
     )
 
-    # Merge groupings
-    df_joined = pd.merge(
-        question_290_df,
-        other_questions_df,
-        on=[period, reference],
-        how="left",
+    # Rows are in the same order as responses, so the flag is set by position
+    responses["290_flag"] = (
+        df["status"].isin(["Clear - overridden", "Clear"]).to_numpy()
+        & is_290_case.to_numpy()
     )
 
-    # Create index of pairs of period and reference numbers which need to be
-    # flagged as the special 290 case
-    flagged_pairs = df_joined[
-        (df_joined[f"{adjusted_response}_x"] != df_joined[f"{adjusted_response}_y"])
-        & (df_joined[f"{adjusted_response}_y"].isin([0, np.nan]))
-    ].index
-
-    # Initialise flag
-    responses["290_flag"] = False
-
-    # Set flag based on index
-    responses.loc[
-        pd.MultiIndex.from_frame(responses[[period, reference]]).isin(flagged_pairs),
-        ["290_flag"],
-    ] = True
-
     # Return modified DataFrame
     return responses
 
@@ -21,7 +21,8 @@ def flag_total_only_and_zero(
     responses : pd.DataFrame
         Dataframe containing response-level data.
     contributors : pd.DataFrame
-        Dataframe containing contributor-level data.
+        Dataframe containing contributor-level data, if None then responses must
+        already have the status column.
     reference : str
         Column containing reference values.
     period : str
@@ -73,29 +74,34 @@ def flag_total_only_and_zero(
      5  202201          3       4       0                   False
     """
 
-    df = responses.merge(contributors, how="left", on=[period, reference]).copy()
+    if contributors is None:
+        df = responses
+    else:
+        df = responses.merge(contributors, how="left", on=[period, reference])
 
-    df_filtered = df[df["status"].isin(clear_statuses)]
-
-    df_with_conditions = df_filtered.groupby([reference, period]).agg(
+    # Built-in groupby sums per reference and period, missing values are counted
+    # so that a group with any missing value is not flagged
+    conditions = pd.DataFrame(
         {
-            # check if sum is zero
-            values: lambda x: (sum(x) == 0),
-            # check only q290 exists no other questions
-            qcodes: lambda x: (all(x == total_question_code)),
+            reference: df[reference].to_numpy(),
+            period: df[period].to_numpy(),
+            "values_sum": df[values].to_numpy(),
+            "missing_values": df[values].isna().to_numpy(),
+            # count of rows which are not q290
+            "other_questions": (df[qcodes] != total_question_code).to_numpy(),
         }
     )
 
-    total_only_and_0 = df_with_conditions.loc[
-        (df_with_conditions[values]) & (df_with_conditions[qcodes])
-    ]
-
-    # initialise flag column (default false)
-    responses["is_total_only_and_zero"] = False
+    group_sums = conditions.groupby([reference, period], sort=False)[
+        ["values_sum", "missing_values", "other_questions"]
+    ].transform("sum")
 
-    responses = responses.set_index([reference, period])
-
-    # set to true for indices(period,reference) in total_only_and_0
-    responses.loc[total_only_and_0.index, "is_total_only_and_zero"] = True
+    # Rows are in the same order as responses, so the flag is set by position
+    responses["is_total_only_and_zero"] = (
+        df["status"].isin(clear_statuses).to_numpy()
+        & (group_sums["values_sum"] == 0).to_numpy()
+        & (group_sums["missing_values"] == 0).to_numpy()
+        & (group_sums["other_questions"] == 0).to_numpy()
+    )
 
-    return responses.reset_index()
+    return responses
@@ -0,0 +1,98 @@
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+
+def group_codes(df: pd.DataFrame, keys: List[str]) -> (np.ndarray, int):
+    """
+    Labels every row of df with the position of its group, so grouped results
+    can be computed once per group and scattered back to rows by position
+    instead of being merged or mapped on a MultiIndex.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe to label.
+    keys : List[str]
+        Column names defining the groups.
+
+    Returns
+    -------
+    codes : np.ndarray
+        Group position of every row in order of first appearance, -1 for rows
+        with missing keys (these are dropped by groupby).
+    n_groups : int
+        Number of groups.
+    """
+    codes = df.groupby(keys, sort=False).ngroup()
+
+    codes = codes.fillna(-1).to_numpy(dtype=np.int64)
+
+    return codes, int(codes.max(initial=-1)) + 1
+
+
+def grouped_sum(
+    values: pd.Series, codes: np.ndarray, n_groups: int, mask: pd.Series = None
+) -> np.ndarray:
+    """
+    Sums values within groups, optionally only over rows where mask is True.
+    Groups without any (masked) rows are nan, matching a groupby sum on the
+    filtered rows mapped back to all groups, in which case the sums are float.
+
+    Parameters
+    ----------
+    values : pd.Series
+        Values to sum.
+    codes : np.ndarray
+        Group positions from group_codes.
+    n_groups : int
+        Number of groups from group_codes.
+    mask : pd.Series, optional
+        Rows to include. The default is None, all rows are included.
+
+    Returns
+    -------
+    np.ndarray
+        Sum of every group, indexed by group position.
+    """
+    include = codes >= 0
+
+    if mask is not None:
+        include &= np.asarray(mask, dtype=bool)
+
+    # groupby sum is used over np.bincount to keep its nan handling and
+    # compensated summation
+    sums = pd.Series(values.to_numpy()[include]).groupby(codes[include]).sum()
+
+    if len(sums) == n_groups:
+        # every group has rows, keep the dtype of the sums like groupby does
+        return sums.to_numpy()
+
+    result = np.full(n_groups, np.nan)
+    result[sums.index.to_numpy()] = sums.to_numpy()
+
+    return result
+
+
+def broadcast_to_rows(group_values: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """
+    Scatters a value per group back to every row of the group, rows with a
+    code of -1 get nan.
+
+    Parameters
+    ----------
+    group_values : np.ndarray
+        Values indexed by group position.
+    codes : np.ndarray
+        Group positions from group_codes.
+
+    Returns
+    -------
+    np.ndarray
+        Value of the group of every row.
+    """
+    if (codes < 0).any():
+        return np.append(group_values, np.nan)[codes]
+
+    return group_values[codes]
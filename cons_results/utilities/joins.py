@@ -0,0 +1,58 @@
+from typing import List
+
+import pandas as pd
+
+
+def is_in_keys(df: pd.DataFrame, keys_df: pd.DataFrame, keys: List[str]) -> pd.Series:
+    """
+    Semi-join mask, flags the rows of df whose keys appear in keys_df.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe to flag.
+    keys_df : pd.DataFrame
+        Dataframe with the keys to look up, duplicated keys are allowed.
+    keys : List[str]
+        Column names to join on, must be in both dataframes.
+
+    Returns
+    -------
+    pd.Series
+        Boolean series aligned to df, True where the keys of the row are in
+        keys_df.
+    """
+    df_keys = pd.MultiIndex.from_frame(df[keys])
+    lookup_keys = pd.MultiIndex.from_frame(keys_df[keys])
+
+    return pd.Series(df_keys.isin(lookup_keys), index=df.index)
+
+
+def partition_by_keys(
+    df: pd.DataFrame, keys_df: pd.DataFrame, keys: List[str]
+) -> (pd.DataFrame, pd.DataFrame):
+    """
+    Splits df into the rows whose keys are in keys_df (semi-join) and the rows
+    whose keys are not (anti-join). Unlike an outer merge with an indicator
+    column, no rows are added from keys_df, the columns and dtypes of df are
+    kept and row order within each partition is preserved.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe to split.
+    keys_df : pd.DataFrame
+        Dataframe with the keys to look up, duplicated keys are allowed.
+    keys : List[str]
+        Column names to join on, must be in both dataframes.
+
+    Returns
+    -------
+    matched : pd.DataFrame
+        Rows of df with keys in keys_df.
+    unmatched : pd.DataFrame
+        Rows of df with keys not in keys_df.
+    """
+    mask = is_in_keys(df, keys_df, keys)
+
+    return df[mask], df[~mask]
@@ -0,0 +1,66 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, List
+
+import pandas as pd
+
+EXECUTORS = {"process": ProcessPoolExecutor, "thread": ThreadPoolExecutor}
+
+
+def groupby_apply(
+    df: pd.DataFrame,
+    by: str or List[str],
+    func: Callable[[pd.DataFrame], pd.DataFrame],
+    max_workers: int = None,
+    executor: str = "process",
+) -> pd.DataFrame:
+    """
+    Applies func to each group of df and concatenates the results in sorted
+    group key order, the same order as df.groupby(by).apply(func). Groups are
+    independent so they can be dispatched to a pool of workers, the output
+    does not depend on the number of workers or which group finishes first.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe to apply func to.
+    by : str or List[str]
+        Column name(s) to group by.
+    func : Callable[[pd.DataFrame], pd.DataFrame]
+        Function which takes a group and returns a dataframe, with a process
+        executor this must be picklable (e.g. a module level function or a
+        functools.partial of one).
+    max_workers : int, optional
+        Number of workers, if None or 1 groups are applied serially. The
+        default is None.
+    executor : str, optional
+        Either "process" or "thread". The default is "process".
+
+    Returns
+    -------
+    pd.DataFrame
+        Results of func for every group, with a new RangeIndex.
+
+    Raises
+    ------
+    ValueError
+        If executor is not one of the accepted values.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(
+            f"{executor} is not an accepted executor, use one of {list(EXECUTORS)}"
+        )
+
+    groups = [group for _, group in df.groupby(by)]
+
+    if not groups:
+        return df.iloc[0:0].reset_index(drop=True)
+
+    if max_workers is None or max_workers <= 1:
+        results = [func(group) for group in groups]
+
+    else:
+        with EXECUTORS[executor](max_workers=max_workers) as pool:
+            # map yields results in the order groups were submitted
+            results = list(pool.map(func, groups))
+
+    return pd.concat(results, ignore_index=True)
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+
+def period_to_quarter(period: pd.Series) -> pd.Series:
+    """
+    Quarter of periods in YYYYMM format as an integer code, year * 10 + quarter
+    (e.g. 202304 -> 20232), so quarters can be compared, grouped and sorted as
+    integers. Only final outputs need to be formatted with quarter_to_label.
+
+    Parameters
+    ----------
+    period : pd.Series
+        Periods in YYYYMM format, as integers or strings.
+
+    Returns
+    -------
+    pd.Series
+        Quarter codes.
+    """
+    period = pd.to_numeric(period)
+
+    return (period // 100) * 10 + (period % 100 - 1) // 3 + 1
+
+
+def quarter_to_label(quarter):
+    """
+    Formats quarter codes from period_to_quarter as "YYYYQX" labels.
+
+    Parameters
+    ----------
+    quarter : int or array-like of int
+        Quarter codes.
+
+    Returns
+    -------
+    str or np.ndarray
+        Labels, a single label for a single quarter code.
+    """
+    if np.ndim(quarter) == 0:
+        return f"{quarter // 10}Q{quarter % 10}"
+
+    quarter = np.asarray(quarter)
+
+    # only the distinct quarters are formatted
+    codes, inverse = np.unique(quarter, return_inverse=True)
+    labels = np.array([f"{code // 10}Q{code % 10}" for code in codes], dtype=object)
+
+    return labels[inverse.reshape(quarter.shape)]
+
+
+def label_to_quarter(label: str) -> int:
+    """
+    Quarter code of a quarter label, e.g. "2023Q2" -> 20232.
+
+    Parameters
+    ----------
+    label : str
+        Quarter in any format accepted by pd.Period, e.g. "2023Q2".
+
+    Returns
+    -------
+    int
+        Quarter code.
+    """
+    quarter = pd.Period(label, freq="Q")
+
+    return quarter.year * 10 + quarter.quarter
@@ -1 +1,144 @@
-# PLACEHOLDER TO SETUP STRUCTURE
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from mbs_results.staging.data_cleaning import convert_annual_thousands
+from pandas.testing import assert_frame_equal
+
+from cons_results.imputation.impute import (
+    drop_passenger_columns,
+    fill_converted_auxiliary,
+    impute_questions,
+    join_passenger_columns,
+)
+
+
+def test_fill_converted_auxiliary():
+    """Test output is identical to updating through a reference, period and
+    questioncode index"""
+
+    df_input = pd.DataFrame(
+        data={
+            "reference": [1, 1, 2, 2, 3],
+            "period": [202201, 202201, 202201, 202202, 202202],
+            "questioncode": [201, 202, 201, 201, 290],
+            "frotover": [120.0, 120.0, 240.0, 240.0, np.nan],
+            "converted_frotover": [10000.0, np.nan, np.nan, 20000.0, np.nan],
+        },
+        index=[1, 1, 0, 0, 2],
+    )
+
+    df_expected = df_input.copy()
+
+    null_rows = df_expected[df_expected["converted_frotover"].isna()]
+    updated_rows = convert_annual_thousands(null_rows, "converted_frotover", "frotover")
+    updated_rows.set_index(["reference", "period", "questioncode"], inplace=True)
+    df_expected.set_index(["reference", "period", "questioncode"], inplace=True)
+    df_expected.loc[updated_rows.index, "converted_frotover"] = updated_rows[
+        "converted_frotover"
+    ]
+    df_expected.reset_index(inplace=True)
+    df_expected.index = df_input.index
+
+    df_actual = fill_converted_auxiliary(df_input, "converted_frotover", "frotover")
+
+    # updated in place, keeping the index
+    assert df_actual is df_input
+    assert_frame_equal(df_actual, df_expected)
+
+
+def test_passenger_columns_round_trip():
+    """Test passenger columns are dropped before imputation and joined back
+    unchanged, keeping row order and row count"""
+
+    config = {
+        "reference": "reference",
+        "period": "period",
+        "auxiliary": "frotover",
+        "cell_number": "cell_no",
+        "finalsel_keep_cols": [
+            "formtype",
+            "cell_no",
+            "frotover",
+            "reference",
+            "region",
+            "runame1",
+        ],
+    }
+
+    df_input = pd.DataFrame(
+        data={
+            "reference": [2, 1, 2, 1, 3],
+            "period": [202201, 202201, 202201, 202202, 202202],
+            "questioncode": [201, 201, 202, 202, 201],
+            "adjustedresponse": [10.0, np.nan, 20.0, 30.0, np.nan],
+            "cell_no": [5141, 5142, 5141, 5142, 5143],
+            "frotover": [120.0, 240.0, 120.0, 240.0, np.nan],
+            "formtype": ["0001", "0002", "0001", "0002", "0001"],
+            "region": ["WW", "XX", "WW", "XX", np.nan],
+            "runame1": ["b", "a", "b", "a", "c"],
+        }
+    )
+
+    passenger_cols = ["formtype", "region", "runame1"]
+
+    df, passengers = drop_passenger_columns(df_input, config)
+
+    assert not df.columns.isin(passenger_cols).any()
+    assert len(passengers) == 4
+
+    # stand in for imputation, filling the target without reordering rows
+    df = df.assign(adjustedresponse=df["adjustedresponse"].fillna(0.0))
+
+    df_actual = join_passenger_columns(df, passengers, config)
+
+    assert len(df_actual) == len(df_input)
+    assert_frame_equal(df_actual[passenger_cols], df_input[passenger_cols])
+    assert_frame_equal(
+        df_actual[["reference", "period", "questioncode"]],
+        df_input[["reference", "period", "questioncode"]],
+    )
+
+
+def ratio_of_means(df, target, strata, reference, **kwargs):
+    """Stand in for mbs ratio_of_means at module level so it can be sent to a
+    process pool, imputes the mean of the class and reorders rows"""
+    return df.assign(
+        **{target: df[target].fillna(df.groupby(strata)[target].transform("mean"))}
+    ).sort_values(reference, ascending=False)
+
+
+@pytest.mark.parametrize("imputation_workers", [1, 2])
+@patch("cons_results.imputation.impute.ratio_of_means", ratio_of_means)
+def test_impute_questions_workers(imputation_workers):
+    """Test imputing questions on a process pool gives the same frame as
+    imputing them serially"""
+
+    config = {
+        "reference": "reference",
+        "period": "period",
+        "target": "adjustedresponse",
+        "question_no": "questioncode",
+        "current_period": 202202,
+        "revision_window": 2,
+        "auxiliary_converted": "converted_frotover",
+    }
+
+    df_input = pd.DataFrame(
+        data={
+            "reference": [1, 2, 3, 1, 2, 3, 1, 2, 3],
+            "period": [202201] * 9,
+            "questioncode": [202, 202, 202, 201, 201, 201, 290, 290, 290],
+            "imputation_class": ["A", "A", "B", "A", "A", "B", "A", "A", "B"],
+            "adjustedresponse": [1.0, np.nan, 3.0, 4.0, 6.0, np.nan, np.nan, 9, 9],
+        }
+    )
+
+    df_expected = impute_questions(df_input, {**config, "imputation_workers": None})
+
+    df_actual = impute_questions(
+        df_input, {**config, "imputation_workers": imputation_workers}
+    )
+
+    assert_frame_equal(df_actual, df_expected)
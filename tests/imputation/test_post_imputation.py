@@ -137,14 +137,14 @@ class TestPostImputation:
     def test_validate_r_before_derived_zero(self, filepath, caplog):
         """
         Testing the warning message for validate_r_before_derived_zero function
-        references 7 and 8 should trigger the warning.
+        references 7 to 12 should trigger the warning.
         """
 
         df_input = pd.read_csv(filepath / "validate_r_before_derived_zero_input.csv")
 
         # This is to get the list of indices that should trigger the warning
         false_indices_list = (
-            df_input[df_input["reference"].isin([7, 8, 9, 10, 11])]
+            df_input[df_input["reference"].isin([7, 8, 9, 10, 11, 12])]
             .set_index(["reference", "question_no"])
             .index.tolist()
         )
@@ -163,3 +163,26 @@ class TestPostImputation:
                 reference="reference",
             )
         assert expected_warning in caplog.text
+
+    def test_validate_r_before_derived_zero_output(self, filepath):
+        df_input = pd.read_csv(filepath / "validate_r_before_derived_zero_input.csv")
+
+        expected_output = pd.DataFrame(
+            data={"reference": [7, 8, 9, 10, 11, 12], "question_no": [200] * 6}
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            validate_r_before_derived_zero(
+                df=df_input,
+                question_no="question_no",
+                imputation_flag="imputation_flag",
+                period="period",
+                reference="reference",
+                output_path=tmpdirname,
+                output_file_name="validate_r_before_derived_zero_output.csv",
+            )
+            actual_output = pd.read_csv(
+                os.path.join(tmpdirname, "validate_r_before_derived_zero_output.csv")
+            )
+
+        assert_frame_equal(actual_output, expected_output)
@@ -129,3 +129,29 @@ def test_run_integration_parametrised(
     )
 
     pd.testing.assert_frame_equal(df_sorted, expected_sorted)
+
+
+@pytest.mark.parametrize("snapshot_file", ["non_response_1.json", "total_only_1.json"])
+def test_impute_with_imputation_workers(test_config, filepath, snapshot_file):
+    """Imputing questions on a process pool gives the same frame as serially"""
+    config = load_config_temp()
+    config.update(test_config)
+    config["snapshot_file_path"] = str(filepath / snapshot_file)
+
+    df, unprocessed_data, manual_constructions, filter_df = stage_dataframe(config)
+
+    expected_df = impute(
+        df.copy(),
+        {**config, "imputation_workers": None},
+        manual_constructions,
+        filter_df,
+    )
+
+    actual_df = impute(
+        df.copy(),
+        {**config, "imputation_workers": 2},
+        manual_constructions,
+        filter_df,
+    )
+
+    pd.testing.assert_frame_equal(actual_df, expected_df)
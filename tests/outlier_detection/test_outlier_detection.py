@@ -1 +1,117 @@
-# PLACEHOLDER TO SETUP STRUCTURE
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from cons_results.outlier_detection.detect_outlier import (
+    detect_outlier,
+    detect_outlier_sweep,
+)
+
+MODULE = "cons_results.outlier_detection.detect_outlier"
+
+L_VALUES = {"low_l_values.csv": 20.0, "high_l_values.csv": 100.0}
+
+
+def join_l_values(df, l_values_path, classification_values_path, config):
+    """Stand in for mbs join_l_values, one l value per file"""
+    return df.assign(l_value=L_VALUES[l_values_path])
+
+
+def winsorise(
+    df, strata, period, auxiliary, census, a_weight, g_weight, target, l_value
+):
+    """Stand in for mbs winsorise, responses above the l value are capped"""
+    return df.assign(outlier_weight=(df[l_value] / df[target]).clip(upper=1.0))
+
+
+def replace_with_manual_outlier_weights(df, *args):
+    return df
+
+
+@pytest.fixture
+def config():
+    return {
+        "reference": "reference",
+        "period": "period",
+        "question_no": "questioncode",
+        "target": "adjustedresponse",
+        "strata": "cellno",
+        "auxiliary": "frotover",
+        "census": "is_census",
+        "components_questions": [201, 202],
+        "classification_values_path": "classification_values.csv",
+        "l_values_path": "low_l_values.csv",
+    }
+
+
+@patch(
+    f"{MODULE}.replace_with_manual_outlier_weights", replace_with_manual_outlier_weights
+)
+@patch(f"{MODULE}.winsorise", winsorise)
+@patch(f"{MODULE}.join_l_values", join_l_values)
+def test_detect_outlier_sweep(config):
+    """Test every scenario is winsorised with its own l values"""
+
+    input_df = pd.DataFrame(
+        {
+            "reference": [1, 1, 1],
+            "period": [202201, 202201, 202201],
+            "questioncode": [201, 202, 290],
+            "adjustedresponse": [10.0, 30.0, 40.0],
+        }
+    )
+
+    expected_output = pd.DataFrame(
+        {
+            "reference": [1] * 6,
+            "period": [202201] * 6,
+            "questioncode": [201, 202, 290] * 2,
+            "adjustedresponse": [10.0, 30.0, 40.0] * 2,
+            "outlier_weight": [1.0, 2 / 3, 0.75, 1.0, 1.0, 1.0],
+            "scenario": ["low"] * 3 + ["high"] * 3,
+            "winsorised_value": [10.0, 20.0, 30.0, 10.0, 30.0, 40.0],
+        }
+    )
+
+    actual_output = detect_outlier_sweep(
+        input_df,
+        config,
+        {"low": "low_l_values.csv", "high": "high_l_values.csv"},
+    )
+
+    assert_frame_equal(actual_output, expected_output)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+@patch(
+    f"{MODULE}.replace_with_manual_outlier_weights", replace_with_manual_outlier_weights
+)
+@patch(f"{MODULE}.winsorise", winsorise)
+@patch(f"{MODULE}.join_l_values", join_l_values)
+def test_detect_outlier_workers(config, executor):
+    """Test winsorising questions on a pool gives the same frame as winsorising
+    them serially, with rows in the same order"""
+
+    input_df = pd.DataFrame(
+        {
+            "reference": [1, 2, 1, 2, 1, 2],
+            "period": [202201] * 6,
+            "questioncode": [202, 202, 201, 201, 290, 290],
+            "adjustedresponse": [30.0, 5.0, 10.0, 40.0, 40.0, 45.0],
+        }
+    )
+
+    expected_output = detect_outlier(input_df, config)
+
+    actual_output = detect_outlier(
+        input_df,
+        {
+            **config,
+            "outlier_detection_workers": 2,
+            "outlier_detection_executor": executor,
+        },
+    )
+
+    assert_frame_equal(actual_output, expected_output)
@@ -0,0 +1,153 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from cons_results.outputs.aggregation_cube import AggregationCube
+from cons_results.outputs.imputation_contribution_output import (
+    get_imputation_contribution_output,
+)
+from cons_results.outputs.quarterly_by_sizeband_output import (
+    get_quarterly_by_sizeband_output,
+)
+
+
+@pytest.fixture
+def config():
+    return {
+        "period": "period",
+        "question_no": "questioncode",
+        "target": "adjustedresponse",
+        "cell_number": "cell_no",
+        "components_questions": [201, 202],
+        "sizeband_quarter": [],
+        "imputation_contribution_periods": [],
+        "run_id": "1",
+    }
+
+
+@pytest.fixture
+def input_df():
+    return pd.DataFrame(
+        {
+            "period": [202301, 202301, 202302, 202304, 202304, 202304, 202304],
+            "questioncode": [201, 202, 201, 201, 202, 202, 290],
+            "cell_no": [5141, 5141, 5142, 5141, 5142, 5142, 5142],
+            "imputation_flags_adjustedresponse": ["r", "fir", "c", "r", "r", "d", "r"],
+            "adjustedresponse": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0],
+            "design_weight": [2.0, 2.0, 1.0, 1.0, 1.0, 1.0, 1.0],
+            "outlier_weight": 1.0,
+            "calibration_factor": 1.0,
+        }
+    )
+
+
+def test_roll_up(input_df, config):
+
+    expected_output = pd.DataFrame(
+        {
+            "quarter": ["2023Q1", "2023Q1", "2023Q2", "2023Q2"],
+            "returned_or_imputed": ["imputed", "returned", "returned", float("nan")],
+            "grossed_value_sum": [7.0, 2.0, 9.0, 6.0],
+        }
+    )
+
+    actual_output = AggregationCube(input_df, config).roll_up(
+        ["quarter", "returned_or_imputed"], "adjustedresponse"
+    )
+
+    assert_frame_equal(actual_output, expected_output)
+
+
+def test_roll_up_filters(input_df, config):
+
+    expected_output = pd.DataFrame(
+        {"questioncode": [201, 202], "grossed_value_sum": [5.0, 4.0]}
+    )
+
+    actual_output = AggregationCube(input_df, config).roll_up(
+        ["questioncode"], "adjustedresponse", period=[202301, 202302]
+    )
+
+    assert_frame_equal(actual_output, expected_output)
+
+
+def test_cube_is_built_once(input_df, config, monkeypatch):
+
+    aggregation_cube = AggregationCube(input_df, config)
+    build = aggregation_cube._build
+    calls = []
+
+    def counted_build():
+        calls.append(1)
+        return build()
+
+    monkeypatch.setattr(aggregation_cube, "_build", counted_build)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(
+            pool.map(
+                lambda _: aggregation_cube.roll_up(["sizeband"], "adjustedresponse"),
+                range(8),
+            )
+        )
+
+    assert len(calls) == 1
+
+
+def test_roll_up_value_columns(input_df, config):
+    """Grossed values of each value column are summed separately"""
+
+    config = {**config, "target": "adjustedresponse_pounds_thousands"}
+    input_df = input_df.assign(
+        adjustedresponse_pounds_thousands=input_df["adjustedresponse"] / 1000
+    )
+
+    aggregation_cube = AggregationCube(input_df, config)
+
+    assert aggregation_cube.roll_up(["quarter"], "adjustedresponse")[
+        "grossed_value_sum"
+    ].tolist() == [9.0, 15.0]
+    assert aggregation_cube.roll_up(["quarter"], config["target"])[
+        "grossed_value_sum"
+    ].tolist() == pytest.approx([0.009, 0.015])
+
+
+def test_roll_up_keys(input_df, config):
+    """A cube of some of the keys does not need the columns of the others"""
+
+    expected_output = pd.DataFrame(
+        {"questioncode": [201, 202], "grossed_value_sum": [9.0, 15.0]}
+    )
+
+    actual_output = AggregationCube(
+        input_df.drop(columns="cell_no"),
+        config,
+        keys=["period", "questioncode"],
+        value_columns=["adjustedresponse"],
+    ).roll_up(["questioncode"], "adjustedresponse")
+
+    assert_frame_equal(actual_output, expected_output)
+
+
+@pytest.mark.parametrize(
+    "get_output",
+    [get_quarterly_by_sizeband_output, get_imputation_contribution_output],
+)
+def test_outputs_from_shared_cube(input_df, config, get_output):
+    """Outputs rolled up from the cube of all keys shared by the outputs match
+    outputs rolled up from their own cube"""
+
+    config = {**config, "target": "adjustedresponse_pounds_thousands"}
+    input_df = input_df.assign(
+        adjustedresponse_pounds_thousands=input_df["adjustedresponse"] / 1000
+    )
+
+    expected_output = get_output(input_df, **config)
+
+    actual_output = get_output(
+        input_df, aggregation_cube=AggregationCube(input_df, config), **config
+    )
+
+    assert_frame_equal(actual_output, expected_output)
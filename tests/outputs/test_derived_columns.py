@@ -0,0 +1,118 @@
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+from cons_results.outputs.derived_columns import (
+    add_derived_output_columns,
+    derived_output_columns,
+    get_grossed_value,
+    get_quarter,
+    get_sizeband,
+)
+
+
+@pytest.fixture
+def config():
+    return {
+        "period": "period",
+        "cell_number": "cell_no",
+        "pound_thousand_col": "adjustedresponse_pounds_thousands",
+        "target": "adjustedresponse",
+    }
+
+
+@pytest.fixture
+def input_df():
+    return pd.DataFrame(
+        {
+            "period": [202301, 202303, 202304, 202312],
+            "cell_no": [5141, 5143, 5147, 5140],
+            "adjustedresponse": [1000.0, 2000.0, 3000.0, 4000.0],
+            "adjustedresponse_pounds_thousands": [1.0, 2.0, 3.0, None],
+            "design_weight": [2.0, 1.0, 1.0, 1.0],
+            "outlier_weight": [1.0, 0.5, 1.0, 1.0],
+            "calibration_factor": [1.0, 1.0, 3.0, 1.0],
+        }
+    )
+
+
+def test_add_derived_output_columns(input_df, config):
+
+    expected_output = input_df.assign(
+        grossed_adjustedresponse_pounds_thousands=[2.0, 1.0, 9.0, None],
+        grossed_adjustedresponse=[2000.0, 1000.0, 9000.0, 4000.0],
+        quarter=["2023Q1", "2023Q1", "2023Q2", "2023Q4"],
+        sizeband=pd.array([1, 3, 7, 0], dtype="Int64"),
+    )
+
+    actual_output = add_derived_output_columns(input_df, config)
+
+    assert_frame_equal(actual_output, expected_output)
+    assert list(actual_output.columns[len(input_df.columns) :]) == (
+        derived_output_columns(config)
+    )
+    assert "quarter" not in input_df.columns
+
+
+def test_derived_output_columns_without_value_columns():
+
+    assert derived_output_columns({"target": "adjustedresponse"}) == [
+        "grossed_adjustedresponse",
+        "quarter",
+        "sizeband",
+    ]
+
+
+def test_derived_columns_are_read_when_present(input_df, config):
+
+    df = add_derived_output_columns(input_df, config)
+    df["quarter"] = "shared"
+
+    assert (get_quarter(df, "period") == "shared").all()
+
+    # each value column is grossed on its own
+    for value_column in ["adjustedresponse", "adjustedresponse_pounds_thousands"]:
+        assert_series_equal(
+            get_grossed_value(df, value_column),
+            df[f"grossed_{value_column}"],
+        )
+
+
+def test_derived_columns_fallback(input_df):
+
+    assert_series_equal(
+        get_grossed_value(input_df, "adjustedresponse"),
+        pd.Series([2000.0, 1000.0, 9000.0, 4000.0]),
+    )
+    assert_series_equal(
+        get_quarter(input_df, "period"),
+        pd.Series(["2023Q1", "2023Q1", "2023Q2", "2023Q4"], name="period"),
+    )
+    assert_series_equal(
+        get_sizeband(input_df, "cell_no"),
+        pd.Series([1, 3, 7, 0], name="cell_no", dtype="Int64"),
+    )
+
+
+@pytest.mark.parametrize(
+    "cell_number",
+    [[5141, 5147], [5141.0, 5147.0], ["5141", "5147"]],
+)
+def test_sizeband_cell_number_dtypes(cell_number):
+
+    df = pd.DataFrame({"cell_no": cell_number})
+
+    assert_series_equal(
+        get_sizeband(df, "cell_no"),
+        pd.Series([1, 7], name="cell_no", dtype="Int64"),
+    )
+
+
+def test_sizeband_missing_cell_number():
+
+    df = pd.DataFrame({"cell_no": [5141.0, None, 5147.0]})
+
+    assert_series_equal(
+        get_sizeband(df, "cell_no"),
+        pd.Series([1, None, 7], name="cell_no", dtype="Int64"),
+    )
@@ -1,10 +1,11 @@
 import pandas as pd
 import pytest
-from pandas.testing import assert_frame_equal
+from pandas.testing import assert_frame_equal, assert_series_equal
 
 from cons_results.outputs.imputation_contribution_output import (
     get_imputation_contribution_output,
 )
+from cons_results.outputs.qa_output import produce_qa_output
 
 
 @pytest.fixture(scope="class")
@@ -44,3 +45,65 @@ class TestImputationContributionOutput:
         actual_output = actual_output[["questioncode", "total", "returned", "imputed"]]
 
         assert_frame_equal(actual_output.reset_index(drop=True), expected_output)
+
+
+def test_imputation_contribution_output_after_qa_output():
+    """QA output marker changes (derived zeros to fir, total only suffix) are
+    not seen by outputs built after it from the same dataframe"""
+
+    df = pd.DataFrame(
+        {
+            "reference": [1, 1, 1, 2, 2],
+            "period": 202302,
+            "questioncode": [201, 202, 290, 201, 202],
+            "imputation_flags_adjustedresponse": ["fir", "r", "r", "r", "fir"],
+            "adjustedresponse": [1000.0, 2000.0, 3000.0, 4000.0, 5000.0],
+            "adjustedresponse_pounds_thousands": [1.0, 2.0, 3.0, 4.0, 5.0],
+            "design_weight": 1.0,
+            "outlier_weight": 1.0,
+            "calibration_factor": 1.0,
+            "sic": 41200,
+            "cell_no": 5141,
+            "frotover": 100,
+            "froempment": 10,
+            "runame1": ["A", "A", "A", "B", "B"],
+            "nil_status_col": "N",
+            "290_flag": [True, False, False, False, False],
+            "derived_zeros": [False, False, False, True, False],
+        }
+    )
+    input_markers = df["imputation_flags_adjustedresponse"].copy()
+
+    config = {
+        "period": "period",
+        "reference": "reference",
+        "question_no": "questioncode",
+        "target": "adjustedresponse",
+        "pound_thousand_col": "adjustedresponse_pounds_thousands",
+        "cell_number": "cell_no",
+        "auxiliary": "frotover",
+        "froempment": "froempment",
+        "sic": "sic",
+        "imputation_marker_col": "imputation_flags_adjustedresponse",
+        "nil_status_col": "nil_status_col",
+        "filter_out_questions": [11, 12],
+        "components_questions": [201, 202],
+        "imputation_contribution_periods": [],
+        "run_id": "1",
+    }
+
+    produce_qa_output(df, **config)
+
+    expected_output = pd.DataFrame(
+        {
+            "questioncode": [290, 201, 202],
+            "returned": [6.0, 4.0, 2.0],
+            "total": [12.0, 5.0, 7.0],
+            "imputed": [6.0, 1.0, 5.0],
+        }
+    )
+
+    actual_output = get_imputation_contribution_output(df, **config)
+
+    assert_frame_equal(actual_output, expected_output)
+    assert_series_equal(df["imputation_flags_adjustedresponse"], input_markers)
@@ -1 +1,149 @@
-# PLACEHOLDER TO SETUP STRUCTURE
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from cons_results.outputs.produce_additional_outputs import (
+    produce_additional_outputs,
+    save_additional_output,
+)
+
+MODULE = "cons_results.outputs.produce_additional_outputs"
+
+
+def get_additional_outputs(config, function_mapper, df, qa_outputs, optional_outputs):
+    """Stand in for mbs get_additional_outputs, QA output is selected first.
+    Nothing is returned, the selected outputs must still be built and saved"""
+    for output in ["produce_qa_output", "imputes_and_constructed_output"]:
+        function_mapper[output](additional_outputs_df=df, **config)
+
+
+def qa_output(additional_outputs_df, **config):
+    yield 202201, additional_outputs_df
+
+
+def imputes_and_constructed_output(additional_outputs_df, **config):
+    return additional_outputs_df, "constructed228_202201.csv"
+
+
+@pytest.mark.parametrize("workers", [None, 1, 2])
+@patch(f"{MODULE}.write_csv_wrapper")
+@patch(f"{MODULE}.get_imputes_and_constructed_output", imputes_and_constructed_output)
+@patch(f"{MODULE}.produce_qa_output_by_period", qa_output)
+@patch(f"{MODULE}.get_additional_outputs", get_additional_outputs)
+def test_produce_additional_outputs(mock_write_csv_wrapper, workers):
+    """Test constructed228 is saved first and every output is saved"""
+
+    config = {
+        "run_id": "1",
+        "output_path": "output/",
+        "output_path_replication": "replication/",
+        "platform": "network",
+        "bucket": "",
+        "additional_outputs_workers": workers,
+        "period": "period",
+        "cell_number": "cell_no",
+        "target": "adjustedresponse",
+        "pound_thousand_col": "adjustedresponse_pounds_thousands",
+    }
+
+    additional_outputs_df = pd.DataFrame(
+        {
+            "reference": [1],
+            "period": [202201],
+            "cell_no": [5141],
+            "adjustedresponse": [1000.0],
+            "adjustedresponse_pounds_thousands": [1.0],
+            "design_weight": [1.0],
+            "outlier_weight": [1.0],
+            "calibration_factor": [1.0],
+        }
+    )
+
+    produce_additional_outputs(additional_outputs_df, True, False, config=config)
+
+    # derived columns are only added to a working copy
+    assert "quarter" not in additional_outputs_df.columns
+
+    saved = [call.args[1] for call in mock_write_csv_wrapper.call_args_list]
+
+    assert len(saved) == 2
+    assert "replication/constructed228_202201.csv" in saved
+
+    if workers in [None, 1]:
+        assert saved[0] == "replication/constructed228_202201.csv"
+
+
+def get_additional_outputs_without_calls(
+    config, function_mapper, df, qa_outputs, optional_outputs
+):
+    """Stand in for an mbs get_additional_outputs which builds the outputs
+    itself instead of calling the function mapper"""
+    return {"produce_qa_output": (df, None)}
+
+
+@patch(f"{MODULE}.write_csv_wrapper")
+@patch(f"{MODULE}.get_additional_outputs", get_additional_outputs_without_calls)
+def test_produce_additional_outputs_not_recorded(mock_write_csv_wrapper):
+    """Test an error is raised if outputs are selected without being recorded"""
+
+    config = {
+        "period": "period",
+        "cell_number": "cell_no",
+        "target": "adjustedresponse",
+        "pound_thousand_col": "adjustedresponse_pounds_thousands",
+    }
+
+    additional_outputs_df = pd.DataFrame(
+        {
+            "period": [202201],
+            "cell_no": [5141],
+            "adjustedresponse": [1000.0],
+            "adjustedresponse_pounds_thousands": [1.0],
+            "design_weight": [1.0],
+            "outlier_weight": [1.0],
+            "calibration_factor": [1.0],
+        }
+    )
+
+    with pytest.raises(RuntimeError, match="produce_qa_output"):
+        produce_additional_outputs(additional_outputs_df, True, False, config=config)
+
+    mock_write_csv_wrapper.assert_not_called()
+
+
+@patch(f"{MODULE}.write_csv_wrapper")
+def test_save_additional_output_filenames(mock_write_csv_wrapper):
+    """Test dataframes of a dictionary are saved with the key as prefix, unless
+    they have their own filename"""
+
+    config = {
+        "run_id": "1",
+        "output_path": "output/",
+        "platform": "network",
+        "bucket": "",
+    }
+
+    save_additional_output(
+        "produce_qa_output",
+        {"Period 1": pd.DataFrame()},
+        None,
+        config,
+    )
+    save_additional_output(
+        "r_m_output",
+        {
+            "2023Q1": (pd.DataFrame(), "r_and_m_regional_extracts_2023Q1_1.csv"),
+            "2023Q2": (pd.DataFrame(), "r_and_m_regional_extracts_2023Q2_1.csv"),
+        },
+        None,
+        config,
+    )
+
+    saved = [call.args[1] for call in mock_write_csv_wrapper.call_args_list]
+
+    assert saved[1:] == [
+        "output/r_and_m_regional_extracts_2023Q1_1.csv",
+        "output/r_and_m_regional_extracts_2023Q2_1.csv",
+    ]
+    assert saved[0].startswith("output/period_1_produce_qa_output")
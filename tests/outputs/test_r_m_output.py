@@ -2,17 +2,14 @@ from pathlib import Path
 
 import pandas as pd
 import pytest
-from mbs_results.outputs.scottish_welsh_gov_outputs import read_and_combine_ludets_files
 from pandas.testing import assert_frame_equal
 
 from cons_results.outputs.r_m_output import (
-    calculate_regional_employment,
-    calculate_regional_percent,
-    calculate_regional_turnover,
-    calculate_total_employment,
-    handle_rus_not_in_ludets,
+    apportion_turnover_to_regions,
+    calculate_regional_shares,
     produce_r_m_output,
     reformat_r_m_output,
+    reformat_r_m_output_all_quarters,
 )
 
 
@@ -31,46 +28,6 @@ def output_df(filepath):
     return pd.read_csv(filepath / "output_df.csv", index_col=False)
 
 
-@pytest.fixture(scope="class")
-def calculate_regional_employment_output(filepath):
-    return pd.read_csv(
-        filepath / "calculate_regional_employment_output.csv", index_col=False
-    )
-
-
-@pytest.fixture(scope="class")
-def calculate_total_employment_output(filepath):
-    return pd.read_csv(
-        filepath / "calculate_total_employment_output.csv", index_col=False
-    )
-
-
-@pytest.fixture(scope="class")
-def calculate_regional_percent_output(filepath):
-    return pd.read_csv(
-        filepath / "calculate_regional_percent_output.csv", index_col=False
-    )
-
-
-@pytest.fixture(scope="class")
-def calculate_regional_turnover_output(filepath):
-    return pd.read_csv(
-        filepath / "calculate_regional_turnover_output.csv", index_col=False
-    )
-
-
-@pytest.fixture(scope="class")
-def handle_rus_not_in_ludets_input(filepath):
-    return pd.read_csv(filepath / "handle_rus_not_in_ludets_input.csv", index_col=False)
-
-
-@pytest.fixture(scope="class")
-def handle_rus_not_in_ludets_output(filepath):
-    return pd.read_csv(
-        filepath / "handle_rus_not_in_ludets_output.csv", index_col=False
-    )
-
-
 @pytest.fixture(scope="class")
 def reformat_input(filepath):
     return pd.read_csv(filepath / "reformat_input.csv", index_col=False)
@@ -81,46 +38,6 @@ def reformat_output(filepath):
     return pd.read_csv(filepath / "reformat_output.csv", index_col=False)
 
 
-@pytest.fixture(scope="class")
-def ludets_data(filepath):
-
-    config = {
-        "idbr_folder_path": filepath,
-        "ludets_prefix": "dummy_ludets228",
-        "current_period": 202304,
-        "revision_window": 2,
-        "platform": "network",
-        "local_unit_columns": [
-            "ruref",
-            "entref",
-            "lu ref",
-            "check letter",
-            "sic03",
-            "sic07",
-            "employees",
-            "employment",
-            "fte",
-            "Name1",
-            "Name2",
-            "Name3",
-            "Address1",
-            "Address2",
-            "Address3",
-            "Address4",
-            "Address5",
-            "Postcode",
-            "trading as 1",
-            "trading as 2",
-            "trading as 3",
-            "region",
-        ],
-        "period": "period",
-        "bucket": "",
-    }
-
-    return read_and_combine_ludets_files(config)
-
-
 class TestRMOutput:
     def test_r_m_output(self, filepath, input_df, output_df):
 
@@ -185,104 +102,169 @@ class TestRMOutput:
 
         assert_frame_equal(expected_output, actual_output)
 
-    def test_calculate_regional_employment(
-        self, ludets_data, calculate_regional_employment_output
-    ):
+    def test_reformat_r_m_output(self, reformat_input, reformat_output):
+
+        config = {
+            "question_no_plaintext": {
+                "202": "public_housing",
+                "212": "private_housing",
+            },
+            "r_m_region_order": {
+                "North East": 1,
+                "Yorkshire and The Humber": 2,
+                "East Midlands": 3,
+                "East of England": 4,
+                "London": 5,
+                "South East": 6,
+                "South West": 7,
+                "Wales": 8,
+                "West Midlands": 9,
+                "North West": 10,
+                "Scotland": 11,
+            },
+            "r_m_quarter": "2023Q2",
+        }
 
-        ludets_data["reference"] = ludets_data["ruref"]
+        expected_output = reformat_output
 
-        expected_output = calculate_regional_employment_output
-        actual_output = calculate_regional_employment(ludets_data, "Scotland", ["XX"])
+        actual_output, qtr = reformat_r_m_output(reformat_input, **config)
 
         assert_frame_equal(expected_output, actual_output)
 
-    def test_calculate_total_employment(
-        self, ludets_data, calculate_total_employment_output
-    ):
+    def test_reformat_r_m_output_all_quarters(self, reformat_input):
 
-        ludets_data["reference"] = ludets_data["ruref"]
+        config = {
+            "question_no_plaintext": {
+                "202": "public_housing",
+                "212": "private_housing",
+            },
+            "r_m_region_order": {"Wales": 1, "Scotland": 2},
+        }
 
-        expected_output = calculate_total_employment_output
-        actual_output = calculate_total_employment(ludets_data)
+        actual_output = reformat_r_m_output_all_quarters(
+            reformat_input.copy(), **config
+        )
 
-        assert_frame_equal(expected_output, actual_output)
+        assert list(actual_output) == ["2023Q1", "2023Q2"]
 
-    def test_calculate_regional_percent(
-        self,
-        calculate_regional_employment_output,
-        calculate_total_employment_output,
-        calculate_regional_percent_output,
-    ):
-
-        expected_output = calculate_regional_percent_output
-        actual_output = calculate_regional_percent(
-            calculate_regional_employment_output,
-            calculate_total_employment_output,
-            "Scotland",
-        )
+        for quarter, actual_quarter_output in actual_output.items():
 
-        assert_frame_equal(expected_output, actual_output)
+            expected_output, _ = reformat_r_m_output(
+                reformat_input.copy(), r_m_quarter=quarter, **config
+            )
 
-    def test_calculate_regional_turnover(
-        self,
-        input_df,
-        calculate_regional_percent_output,
-        calculate_regional_turnover_output,
-    ):
+            assert_frame_equal(expected_output, actual_quarter_output)
 
-        df = input_df[input_df["questioncode"].isin([202, 212])]
 
-        df["gross_turnover_uk"] = (
-            df["adjustedresponse_pounds_thousands"]
-            * df["design_weight"]
-            * df["outlier_weight"]
-            * df["calibration_factor"]
-        )
+@pytest.fixture(scope="class")
+def region_to_code():
+    return {"Scotland": ["XX"], "Wales": ["WW"], "North West": ["BB", "BA"]}
 
-        expected_output = calculate_regional_turnover_output
 
-        actual_output = calculate_regional_turnover(
-            df, calculate_regional_percent_output, "Scotland", ["XX"]
+class TestRegionalShares:
+    def test_calculate_regional_shares(self, region_to_code):
+
+        ludets = pd.DataFrame(
+            {
+                "reference": [1, 1, 1, 2, 2, 3],
+                "period": [202304, 202304, 202304, 202304, 202304, 202304],
+                "region": ["XX", "BB", "BA", "WW", "ZZ", "ZZ"],
+                "employment": [10, 20, 10, 5, 15, 4],
+            }
         )
 
+        expected_output = pd.DataFrame(
+            {
+                "Scotland": [0.25, None],
+                "Wales": [None, 0.25],
+                "North West": [0.75, None],
+            },
+            index=pd.MultiIndex.from_tuples(
+                [(1, 202304), (2, 202304)], names=["reference", "period"]
+            ),
+        ).rename_axis("region", axis=1)
+
+        actual_output = calculate_regional_shares(ludets, region_to_code)
+
         assert_frame_equal(expected_output, actual_output)
 
-    def test_handle_rus_not_in_ludets(
-        self, handle_rus_not_in_ludets_input, handle_rus_not_in_ludets_output
-    ):
+    def test_apportion_turnover_to_regions(self, region_to_code):
+
+        df = pd.DataFrame(
+            {
+                "reference": [1, 2, 4],
+                "period": [202304, 202304, 202304],
+                "questioncode": [202, 212, 202],
+                "region": ["XX", "BA", "WW"],
+                "gross_turnover_uk": [100.0, 10.0, 30.0],
+            }
+        )
+        regional_shares = pd.DataFrame(
+            {
+                "Scotland": [0.25, None],
+                "Wales": [None, 0.25],
+                "North West": [0.75, None],
+            },
+            index=pd.MultiIndex.from_tuples(
+                [(1, 202304), (2, 202304)], names=["reference", "period"]
+            ),
+        )
+
+        # reference 2 has no ludets in North West and reference 4 is not in
+        # ludets, both get 100% of turnover in their region
+        expected_output = pd.DataFrame(
+            {
+                "reference": [1, 2, 4],
+                "period": [202304, 202304, 202304],
+                "questioncode": [202, 212, 202],
+                "turnover_Scotland": [25.0, None, None],
+                "turnover_Wales": [None, 2.5, 30.0],
+                "turnover_North West": [75.0, 10.0, None],
+            }
+        )
 
-        expected_output = handle_rus_not_in_ludets_output
-        actual_output = handle_rus_not_in_ludets(
-            handle_rus_not_in_ludets_input, "Wales", ["WW"]
+        actual_output = apportion_turnover_to_regions(
+            df, regional_shares, region_to_code
         )
 
         assert_frame_equal(expected_output, actual_output)
 
-    def test_reformat_r_m_output(self, reformat_input, reformat_output):
+    def test_apportion_turnover_to_regions_key_dtypes(self, region_to_code):
 
-        config = {
-            "question_no_plaintext": {
-                "202": "public_housing",
-                "212": "private_housing",
-            },
-            "r_m_region_order": {
-                "North East": 1,
-                "Yorkshire and The Humber": 2,
-                "East Midlands": 3,
-                "East of England": 4,
-                "London": 5,
-                "South East": 6,
-                "South West": 7,
-                "Wales": 8,
-                "West Midlands": 9,
-                "North West": 10,
-                "Scotland": 11,
-            },
-            "r_m_quarter": "2023Q2",
-        }
+        df = pd.DataFrame(
+            {
+                "reference": ["1", "2"],
+                "period": [202304.0, 202304.0],
+                "questioncode": [202, 212],
+                "region": ["XX", "WW"],
+                "gross_turnover_uk": [100.0, 10.0],
+            }
+        )
+        regional_shares = pd.DataFrame(
+            {"Scotland": [0.25, None], "Wales": [None, 0.25]},
+            index=pd.MultiIndex.from_tuples(
+                [(1, 202304), (2, 202304)], names=["reference", "period"]
+            ),
+        )
 
-        expected_output = reformat_output
+        # keys are matched after casting to the dtypes of regional_shares
+        expected_output = pd.DataFrame(
+            {
+                "reference": ["1", "2"],
+                "period": [202304.0, 202304.0],
+                "questioncode": [202, 212],
+                "turnover_Scotland": [25.0, None],
+                "turnover_Wales": [None, 2.5],
+            }
+        )
 
-        actual_output, qtr = reformat_r_m_output(reformat_input, **config)
+        actual_output = apportion_turnover_to_regions(
+            df, regional_shares, {"Scotland": ["XX"], "Wales": ["WW"]}
+        )
 
         assert_frame_equal(expected_output, actual_output)
+
+        with pytest.raises(ValueError):
+            apportion_turnover_to_regions(
+                df.assign(reference=["1", "a"]), regional_shares, region_to_code
+            )
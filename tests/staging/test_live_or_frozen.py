@@ -61,3 +61,45 @@ def test_run_live_or_frozen():
 
     assert_frame_equal(responses_actual, responses_expected)
     assert_frame_equal(frozen_responses_actual, frozen_responses_expected)
+
+
+def test_run_live_or_frozen_with_status_joined():
+    """Test frozen run where the status is already joined onto responses"""
+
+    responses_input = pd.DataFrame(
+        data={
+            "reference": [1, 1, 1, 1],
+            "period": [202201, 202201, 202202, 202202],
+            "questioncode": [100, 101, 100, 101],
+            "target": [99, 99, 99, 99],
+            "error_column": [210, 210, 201, 201],
+        }
+    )
+
+    responses_expected = responses_input.iloc[:2]
+
+    frozen_responses_expected = pd.DataFrame(
+        data={
+            "reference": [1, 1],
+            "period": [202202, 202202],
+            "questioncode": [100, 101],
+            "live_target": [99, 99],
+        }
+    )
+
+    responses_actual, frozen_responses_actual = run_live_or_frozen(
+        responses=responses_input,
+        contributors=None,
+        period="period",
+        reference="reference",
+        question_no="questioncode",
+        target="target",
+        status="error_column",
+        current_period=202202,
+        revision_window=2,
+        state="frozen",
+        error_values=[201],
+    )
+
+    assert_frame_equal(responses_actual, responses_expected)
+    assert_frame_equal(frozen_responses_actual, frozen_responses_expected)
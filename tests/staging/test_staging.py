@@ -4,7 +4,11 @@ import pandas as pd
 import pytest
 from pandas.testing import assert_frame_equal
 
-from cons_results.staging.stage_dataframe import flag_290_case, set_290_components_null
+from cons_results.staging.stage_dataframe import (
+    flag_290_case,
+    join_contributor_status,
+    set_290_components_null,
+)
 
 
 @pytest.fixture()
@@ -30,6 +34,28 @@ def test_flag_290_case(filepath):
     assert_frame_equal(output_df, expected_output_df)
 
 
+def test_flag_290_case_with_status_joined(filepath):
+    expected_output_df = pd.read_csv(filepath / "290_flag_expected.csv")
+
+    responses = pd.read_csv(filepath / "290_flag_responses.csv")
+    contributors = pd.read_csv(filepath / "290_flag_contributors.csv")
+
+    responses = join_contributor_status(
+        responses, contributors, "period", "reference", ["status"]
+    )
+
+    output_df = flag_290_case(
+        responses,
+        None,
+        "period",
+        "reference",
+        "question_no",
+        "adjustedresponse",
+    ).drop(columns=["status"])
+
+    assert_frame_equal(output_df, expected_output_df)
+
+
 def test_set_290_component_null(filepath):
     expected_output_df = pd.read_csv(filepath / "290_flag_null_components_expected.csv")
 
@@ -67,3 +67,37 @@ class TestMain:
         test_config["state"] = "live"
 
         run_pipeline(test_config)
+
+    def test_run_pipeline_l_values_sweep(self, test_config, tmp_path):
+        """Run main pipeline with an l values sweep of the configured l values,
+        outlier weights of the sweep should match the outlier output"""
+
+        # outputs are saved to an empty directory so only this run's files match
+        out_path = f"{tmp_path}/"
+
+        config = {
+            **test_config,
+            "state": "frozen",
+            "l_values_sweep_paths": {"base": test_config["l_values_path"]},
+            "output_path": out_path,
+            "output_path_replication": out_path,
+        }
+
+        run_pipeline(config)
+
+        keys = ["reference", "period", "questioncode"]
+
+        (sweep_path,) = glob(out_path + "outlier_sweep_output_*.csv")
+        (outlier_output_path,) = glob(out_path + "outlier_output_*.csv")
+
+        sweep = pd.read_csv(sweep_path)
+        outlier_output = pd.read_csv(outlier_output_path)
+
+        assert (sweep["scenario"] == "base").all()
+
+        actual = sweep[keys + ["outlier_weight"]].sort_values(keys, ignore_index=True)
+        expected = outlier_output[keys + ["outlier_weight"]].sort_values(
+            keys, ignore_index=True
+        )
+
+        assert_frame_equal(actual, expected)
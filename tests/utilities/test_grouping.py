@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_array_equal
+
+from cons_results.utilities.grouping import (
+    broadcast_to_rows,
+    group_codes,
+    grouped_sum,
+)
+
+
+def test_grouped_sum_broadcast_to_rows():
+    """Test masked group sums are scattered back to rows, nan when no rows"""
+
+    df = pd.DataFrame(
+        data={
+            "period": [202201, 202201, 202202, 202202, np.nan],
+            "reference": [2, 2, 1, 1, 1],
+            "value": [1.0, 2.0, 3.0, np.nan, 5.0],
+            "include": [True, True, False, True, True],
+        }
+    )
+
+    codes, n_groups = group_codes(df, ["period", "reference"])
+
+    assert_array_equal(codes, [0, 0, 1, 1, -1])
+    assert n_groups == 2
+
+    sums = grouped_sum(df["value"], codes, n_groups, df["include"])
+
+    assert_array_equal(sums, [3.0, 0.0])
+    assert_array_equal(broadcast_to_rows(sums, codes), [3.0, 3.0, 0.0, 0.0, np.nan])
+
+    sums_on_1 = grouped_sum(df["value"], codes, n_groups, df["reference"] == 1)
+
+    assert_array_equal(sums_on_1, [np.nan, 3.0])
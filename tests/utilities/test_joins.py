@@ -0,0 +1,43 @@
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from cons_results.utilities.joins import partition_by_keys
+
+
+def test_partition_by_keys():
+    """Test rows are split on keys without adding rows from the lookup"""
+
+    df = pd.DataFrame(
+        data={
+            "reference": [2, 1, 1, 2],
+            "period": [202202, 202201, 202202, 202201],
+            "target": [1, 2, 3, 4],
+        }
+    )
+
+    keys_df = pd.DataFrame(
+        data={
+            "reference": [1, 1, 3],
+            "period": [202202, 202202, 202201],
+        }
+    )
+
+    matched_expected = pd.DataFrame(
+        data={"reference": [1], "period": [202202], "target": [3]}, index=[2]
+    )
+
+    unmatched_expected = pd.DataFrame(
+        data={
+            "reference": [2, 1, 2],
+            "period": [202202, 202201, 202201],
+            "target": [1, 2, 4],
+        },
+        index=[0, 1, 3],
+    )
+
+    matched_actual, unmatched_actual = partition_by_keys(
+        df, keys_df, ["reference", "period"]
+    )
+
+    assert_frame_equal(matched_actual, matched_expected)
+    assert_frame_equal(unmatched_actual, unmatched_expected)
@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from cons_results.utilities.parallel import groupby_apply
+
+
+def add_group_total(df):
+    """Module level so it can be pickled for the process executor"""
+    return df.assign(total=df["value"].sum()).iloc[::-1]
+
+
+@pytest.fixture
+def df_input():
+    return pd.DataFrame(
+        data={
+            "questioncode": [202, 201, 290, 201, 202],
+            "value": [1.0, 2.0, 3.0, 4.0, 5.0],
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "max_workers,executor",
+    [(None, "process"), (2, "thread"), (2, "process")],
+)
+def test_groupby_apply(df_input, max_workers, executor):
+    """Test results match a serial groupby apply for every executor"""
+
+    expected_output = (
+        df_input.groupby("questioncode")[df_input.columns]
+        .apply(add_group_total)
+        .reset_index(drop=True)
+    )
+
+    actual_output = groupby_apply(
+        df_input,
+        "questioncode",
+        add_group_total,
+        max_workers=max_workers,
+        executor=executor,
+    )
+
+    assert_frame_equal(actual_output, expected_output)
+
+
+def test_groupby_apply_raises(df_input):
+    with pytest.raises(ValueError):
+        groupby_apply(df_input, "questioncode", add_group_total, 2, "cluster")
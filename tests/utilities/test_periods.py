@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_series_equal
+
+from cons_results.utilities.periods import (
+    label_to_quarter,
+    period_to_quarter,
+    quarter_to_label,
+)
+
+
+@pytest.mark.parametrize("dtype", ["int64", str])
+def test_period_to_quarter(dtype):
+
+    periods = pd.Series([202201, 202203, 202204, 202209, 202210, 202312])
+
+    expected_output = pd.Series([20221, 20221, 20222, 20223, 20224, 20234])
+
+    actual_output = period_to_quarter(periods.astype(dtype))
+
+    assert_series_equal(actual_output, expected_output)
+
+
+def test_quarter_to_label():
+
+    expected_output = np.array(["2023Q4", "2022Q1", "2023Q4"], dtype=object)
+
+    actual_output = quarter_to_label(np.array([20234, 20221, 20234]))
+
+    np.testing.assert_array_equal(actual_output, expected_output)
+    assert quarter_to_label(20232) == "2023Q2"
+
+
+def test_label_to_quarter():
+
+    assert label_to_quarter("2023Q2") == 20232
+    assert quarter_to_label(label_to_quarter("2021Q4")) == "2021Q4"